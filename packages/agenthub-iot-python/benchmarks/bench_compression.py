@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+AgentHub IoT - Benchmark de compresión de series
+
+Compara el codec Gorilla (agenthub_iot.compression) con JSON por lotes sobre
+trazas de temperatura realistas y reporta bytes por punto y velocidad de
+codificación/decodificación.
+
+Uso:
+    python benchmarks/bench_compression.py [--points 10000] [--repeat 5]
+"""
+
+import argparse
+import json
+import math
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from agenthub_iot.compression import decode_series, encode_series  # noqa: E402
+
+
+def temperature_trace(points, interval_ms, resolution, seed):
+    """
+    Generar traza de temperatura
+
+    Ciclo diario + deriva lenta + ruido de sensor, cuantizado a la resolución
+    del sensor (0.0625 °C en un DS18B20 a 12 bits). Los timestamps tienen
+    jitter de ±2 ms y alguna lectura perdida.
+    """
+    rng = random.Random(seed)
+    start = 1_700_000_000_000
+    timestamps = []
+    values = []
+    drift = 0.0
+    slot = 0
+    while len(timestamps) < points:
+        slot += 1
+        if rng.random() < 0.002:
+            continue  # lectura perdida
+        t = start + slot * interval_ms + rng.randint(-2, 2)
+        drift += rng.gauss(0, 0.01)
+        day = 4.0 * math.sin(2 * math.pi * (slot * interval_ms) / 86_400_000)
+        raw = 21.0 + day + drift + rng.gauss(0, 0.04)
+        if resolution:
+            raw = round(raw / resolution) * resolution
+        timestamps.append(t)
+        values.append(raw)
+    return timestamps, values
+
+
+def best_of(repeat, func):
+    best = math.inf
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def run(name, timestamps, values, repeat):
+    points = len(timestamps)
+
+    encode_time, payload = best_of(repeat, lambda: encode_series(timestamps, values))
+    decode_time, decoded = best_of(repeat, lambda: decode_series(payload))
+    assert decoded == (timestamps, values)
+
+    readings = [{"timestamp": t, "value": v} for t, v in zip(timestamps, values)]
+    json_time, json_payload = best_of(
+        repeat, lambda: json.dumps(readings, separators=(",", ":")).encode()
+    )
+
+    print(f"{name:<28} {len(payload) / points:>8.2f} {len(json_payload) / points:>8.2f} "
+          f"{len(json_payload) / len(payload):>7.1f}x "
+          f"{points / encode_time / 1000:>9.0f} {points / decode_time / 1000:>9.0f} "
+          f"{points / json_time / 1000:>9.0f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--points", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{args.points} puntos por traza, mejor de {args.repeat}")
+    print(f"{'traza':<28} {'B/pt':>8} {'JSON':>8} {'ratio':>8} "
+          f"{'enc kpt/s':>9} {'dec kpt/s':>9} {'json kpt/s':>9}")
+
+    scenarios = [
+        ("1 s, DS18B20 0.0625 °C", 1000, 0.0625),
+        ("60 s, DS18B20 0.0625 °C", 60000, 0.0625),
+        ("1 s, 0.01 °C", 1000, 0.01),
+        ("1 s, sin cuantizar", 1000, None),
+    ]
+    for seed, (name, interval_ms, resolution) in enumerate(scenarios):
+        timestamps, values = temperature_trace(args.points, interval_ms, resolution, seed)
+        run(name, timestamps, values, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+AgentHub IoT - Benchmark HTTP/2 frente al pool HTTP/1.1
+
+Simula un gateway con muchas identidades AgentHub enviando lecturas de
+sensores en paralelo contra los stand-ins locales, y compara:
+
+    requests.post sin pool (comportamiento por defecto)
+    RequestsTransport (pool HTTP/1.1)
+    Http2Transport (pocas conexiones HTTP/2 multiplexadas)
+    AsyncHttp2Transport (asyncio, HTTP/2)
+
+Uso:
+    python benchmarks/bench_http2.py [--identities 200] [--requests 5] [--workers 64]
+"""
+
+import argparse
+import asyncio
+import hashlib
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from agenthub_iot import AgentHub  # noqa: E402
+from agenthub_iot.standin import H2StandinServer, StandinServer  # noqa: E402
+from agenthub_iot.transport import (  # noqa: E402
+    AsyncHttp2Transport,
+    Http2Transport,
+    RequestsTransport,
+)
+
+
+def identity_key(index):
+    return "0x" + hashlib.sha256(f"bench-device-{index}".encode()).hexdigest()
+
+
+def make_agents(count, **kwargs):
+    return [AgentHub(f"gateway-device-{i:04d}", identity_key(i), **kwargs) for i in range(count)]
+
+
+def percentile(ordered, fraction):
+    return ordered[int(fraction * (len(ordered) - 1))]
+
+
+def report(name, latencies, errors, elapsed, server):
+    ordered = sorted(latencies)
+    stats = server.stats.snapshot()
+    print(f"{name:<22} {len(latencies) / elapsed:>8.0f} {percentile(ordered, 0.5) * 1000:>8.1f} "
+          f"{percentile(ordered, 0.95) * 1000:>8.1f} {percentile(ordered, 0.99) * 1000:>8.1f} "
+          f"{stats['connections']:>6} {errors:>6}")
+
+
+def run_threads(name, server, agents, per_identity, workers):
+    endpoint = server.url + "/api/iot/sensors"
+
+    def send(job):
+        agent, n = job
+        start = time.perf_counter()
+        result = agent.send_sensor_data(endpoint, {"temperature": 21.5, "n": n})
+        return time.perf_counter() - start, result.get("success")
+
+    jobs = [(agent, n) for n in range(per_identity) for agent in agents]
+    start = time.perf_counter()
+    with ThreadPoolExecutor(workers) as pool:
+        results = list(pool.map(send, jobs))
+    elapsed = time.perf_counter() - start
+    report(name, [r[0] for r in results], sum(1 for r in results if not r[1]), elapsed, server)
+
+
+def run_async(name, server, agents, per_identity, workers):
+    endpoint = server.url + "/api/iot/sensors"
+
+    async def main():
+        semaphore = asyncio.Semaphore(workers)
+
+        async def send(agent, n):
+            async with semaphore:
+                start = time.perf_counter()
+                result = await agent.send_sensor_data_async(endpoint, {"temperature": 21.5, "n": n})
+                return time.perf_counter() - start, result.get("success")
+
+        start = time.perf_counter()
+        results = await asyncio.gather(*[
+            send(agent, n) for n in range(per_identity) for agent in agents
+        ])
+        elapsed = time.perf_counter() - start
+        await agents[0].async_transport.aclose()
+        return results, elapsed
+
+    results, elapsed = asyncio.run(main())
+    report(name, [r[0] for r in results], sum(1 for r in results if not r[1]), elapsed, server)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--identities", type=int, default=200)
+    parser.add_argument("--requests", type=int, default=5, help="peticiones por identidad")
+    parser.add_argument("--workers", type=int, default=64, help="peticiones concurrentes")
+    parser.add_argument("--latency", type=float, default=0.02, help="latencia del servidor (s)")
+    parser.add_argument("--h2-connections", type=int, default=2)
+    args = parser.parse_args()
+
+    total = args.identities * args.requests
+    print(f"{args.identities} identidades x {args.requests} peticiones = {total}, "
+          f"{args.workers} concurrentes, latencia servidor {args.latency * 1000:.0f} ms")
+    print(f"{'transporte':<22} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} "
+          f"{'conns':>6} {'errores':>6}")
+
+    with StandinServer(latency=args.latency) as server:
+        run_threads("HTTP/1.1 sin pool", server, make_agents(args.identities),
+                    args.requests, args.workers)
+
+    with StandinServer(latency=args.latency) as server, \
+            RequestsTransport(pool_maxsize=args.workers) as transport:
+        run_threads("HTTP/1.1 pool", server, make_agents(args.identities, transport=transport),
+                    args.requests, args.workers)
+
+    with H2StandinServer(latency=args.latency) as server, \
+            Http2Transport(max_connections=args.h2_connections, http1=False) as transport:
+        run_threads("HTTP/2", server, make_agents(args.identities, transport=transport),
+                    args.requests, args.workers)
+
+    with H2StandinServer(latency=args.latency) as server:
+        async_transport = AsyncHttp2Transport(max_connections=args.h2_connections, http1=False)
+        run_async("HTTP/2 asyncio", server,
+                  make_agents(args.identities, async_transport=async_transport),
+                  args.requests, args.workers)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+AgentHub IoT - Benchmark de alertas con pagos pre-firmados
+
+Mide la latencia de x402_request contra un servidor HTTP local, firmando en
+línea y tomando autorizaciones del pool pre-firmado.
+
+Uso:
+    python benchmarks/bench_presign.py [--alerts 200]
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from agenthub_iot import AgentHub  # noqa: E402
+
+PRIVATE_KEY = "0x" + "1" * 64
+AMOUNT = "0.0001"
+
+
+class _AlertHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        body = b'{"success":true}'
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def measure(agent, url, alerts, pool=None):
+    latencies = []
+    for i in range(alerts):
+        if pool is not None:
+            # Dejar que el hilo reponga entre alertas, como en uso real
+            while not pool.available()[(url, AMOUNT, "USDC", "basic")]:
+                time.sleep(0.001)
+        start = time.perf_counter()
+        result = agent.x402_request(url, AMOUNT, {"alert": "high_temperature", "n": i})
+        latencies.append(time.perf_counter() - start)
+        assert result.get("success"), result
+    return latencies
+
+
+def report(name, latencies):
+    ordered = sorted(latencies)
+    p95 = ordered[int(0.95 * (len(ordered) - 1))]
+    print(f"{name:<14} p50 {statistics.median(ordered) * 1000:7.2f} ms   "
+          f"p95 {p95 * 1000:7.2f} ms   media {statistics.mean(ordered) * 1000:7.2f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--alerts", type=int, default=200)
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _AlertHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}/api/iot/alerts"
+
+    agent = AgentHub("bench-agent", PRIVATE_KEY)
+    measure(agent, url, 10)  # calentamiento
+
+    start = time.perf_counter()
+    for _ in range(args.alerts):
+        agent._build_payment_header(url, AMOUNT, "USDC", "basic")
+    sign_ms = (time.perf_counter() - start) / args.alerts * 1000
+
+    inline = measure(agent, url, args.alerts)
+    pool = agent.start_presigning([(url, AMOUNT, "USDC", "basic")], pool_size=4)
+    presigned = measure(agent, url, args.alerts, pool)
+    agent.stop_presigning()
+    server.shutdown()
+
+    print(f"{args.alerts} alertas, firma + serialización: {sign_ms:.2f} ms por pago")
+    report("firma en línea", inline)
+    report("pre-firmado", presigned)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+AgentHub IoT - Benchmark del motor de reglas
+
+Evalúa miles de reglas (umbrales, histéresis, tasa de cambio y ventanas)
+sobre un stream de temperatura y reporta lecturas por segundo.
+
+Uso:
+    python benchmarks/bench_rules.py [--rules 5000] [--readings 20000]
+"""
+
+import argparse
+import math
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from agenthub_iot.rules import RuleEngine  # noqa: E402
+
+
+def make_rules(count, sensors, seed):
+    rng = random.Random(seed)
+    rules = []
+    for i in range(count):
+        sensor = f"probe-{i % sensors}"
+        kind = rng.random()
+        if kind < 0.85:
+            rules.append({"name": f"r{i}", "sensor": sensor, "type": "threshold",
+                          "op": rng.choice((">", "<")), "value": rng.uniform(10, 35),
+                          "cooldown": 300})
+        elif kind < 0.93:
+            high = rng.uniform(25, 35)
+            rules.append({"name": f"r{i}", "sensor": sensor, "type": "hysteresis",
+                          "high": high, "low": high - 1.5})
+        elif kind < 0.97:
+            rules.append({"name": f"r{i}", "sensor": sensor, "type": "rate",
+                          "op": ">", "value": 0.02, "window": rng.choice((30, 60)),
+                          "cooldown": 60})
+        else:
+            rules.append({"name": f"r{i}", "sensor": sensor, "type": "window",
+                          "agg": rng.choice(("avg", "min", "max")), "op": ">",
+                          "value": rng.uniform(20, 30), "window": rng.choice((60, 300)),
+                          "cooldown": 300})
+    return rules
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rules", type=int, default=5000)
+    parser.add_argument("--sensors", type=int, default=20)
+    parser.add_argument("--readings", type=int, default=20000)
+    args = parser.parse_args()
+
+    rules = make_rules(args.rules, args.sensors, seed=1)
+    start = time.perf_counter()
+    engine = RuleEngine(rules)
+    compile_time = time.perf_counter() - start
+
+    rng = random.Random(2)
+    readings = []
+    for i in range(args.readings):
+        sensor = f"probe-{i % args.sensors}"
+        t = i / args.sensors  # 1 Hz por sensor
+        value = 22 + 6 * math.sin(t / 900) + rng.gauss(0, 0.1)
+        readings.append((sensor, value, t))
+
+    start = time.perf_counter()
+    alerts = engine.evaluate_many(readings)
+    elapsed = time.perf_counter() - start
+
+    print(f"{args.rules} reglas en {args.sensors} sensores, compiladas en {compile_time * 1000:.1f} ms")
+    print(f"{args.readings} lecturas en {elapsed:.3f} s -> "
+          f"{args.readings / elapsed:,.0f} lecturas/s, {len(alerts)} alertas")
+
+
+if __name__ == "__main__":
+    main()
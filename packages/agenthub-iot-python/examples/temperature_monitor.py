@@ -14,7 +14,7 @@ Requisitos:
 
 import time
 import json
-from agenthub_iot import AgentHub
+from agenthub_iot import AgentHub, RuleEngine
 
 # Configuración
 AGENT_ID = "temp-monitor-001"
@@ -25,6 +25,19 @@ NETWORK = "fuji"  # o "mainnet"
 TEMP_THRESHOLD = 30.0  # Temperatura umbral en Celsius
 ALERT_ENDPOINT = "https://api.agenthub.protocol/api/alerts"
 PAYMENT_AMOUNT = "0.0001"  # 0.0001 USDC
+ALERT_COOLDOWN = 300  # Segundos entre alertas
+
+# Reglas de alerta (ver agenthub_iot.rules para más tipos)
+RULES = [
+    {
+        "name": "high_temperature",
+        "sensor": "temperature",
+        "type": "threshold",
+        "op": ">",
+        "value": TEMP_THRESHOLD,
+        "cooldown": ALERT_COOLDOWN,
+    },
+]
 
 # Inicializar SDK
 print("=== AgentHub IoT Temperature Monitor ===")
@@ -60,17 +73,14 @@ def read_temperature():
     """
     Leer temperatura del sensor
     
-    Para Raspberry Pi con sensor DS18B20:
-    import os
-    os.system('modprobe w1-gpio')
-    os.system('modprobe w1-therm')
+    Para Raspberry Pi con sondas DS18B20 (modprobe w1-gpio w1-therm),
+    SensorBus descubre las sondas en /sys/bus/w1/devices/ y las lee todas
+    en paralelo (una conversión de ~750 ms en total):
     
-    base_dir = '/sys/bus/w1/devices/'
-    device_folder = glob.glob(base_dir + '28*')[0]
-    device_file = device_folder + '/w1_slave'
-    
-    # Leer archivo y parsear temperatura
-    # ...
+    from agenthub_iot import SensorBus
+    bus = SensorBus()
+    readings = bus.read_all()  # [{"sensorId", "sensorType", "value", ...}]
+    return readings[0]["value"]
     
     Para pruebas, retornamos un valor simulado
     """
@@ -81,44 +91,33 @@ def read_temperature():
 
 def main():
     """Loop principal de monitoreo"""
+    # Las reglas envían la alerta con pago x402 al dispararse
+    engine = RuleEngine(
+        RULES,
+        agent=agent,
+        alert_url=ALERT_ENDPOINT,
+        amount=PAYMENT_AMOUNT
+    )
+
     while True:
         try:
             # Leer temperatura
             temperature = read_temperature()
             print(f"Temperatura: {temperature:.2f}°C")
             
-            # Verificar umbral
-            if temperature > TEMP_THRESHOLD:
+            # Evaluar reglas
+            for alert in engine.evaluate("temperature", temperature):
                 print("⚠️ Temperatura alta detectada!")
-                
-                # Crear datos de alerta
-                alert_data = {
-                    "agentId": AGENT_ID,
-                    "temperature": temperature,
-                    "threshold": TEMP_THRESHOLD,
-                    "timestamp": int(time.time() * 1000),
-                    "alert": "high_temperature"
-                }
-                
-                # Enviar alerta con pago x402
-                print("Enviando alerta con pago x402...")
-                response = agent.x402_request(
-                    url=ALERT_ENDPOINT,
-                    amount=PAYMENT_AMOUNT,
-                    data=alert_data
-                )
-                
+                response = alert["result"]
                 if response.get("success"):
                     print("✅ Alerta enviada exitosamente!")
                     print(f"Respuesta: {json.dumps(response.get('data'), indent=2)}")
-                    # Esperar 5 minutos antes de la siguiente alerta
-                    time.sleep(300)
                 else:
+                    # El cooldown no empieza: se reintenta con la siguiente lectura
                     print(f"❌ Error al enviar alerta: {response.get('error')}")
-                    time.sleep(60)
-            else:
-                # Temperatura normal, esperar 1 minuto
-                time.sleep(60)
+            
+            # Esperar 1 minuto
+            time.sleep(60)
                 
         except KeyboardInterrupt:
             print("\n=== Deteniendo monitoreo ===")
@@ -4,7 +4,15 @@ SDK oficial para dispositivos IoT (Raspberry Pi, Linux)
 """
 
 from .client import AgentHub
+from .compression import decode_series, encode_series
+from .rpc import PooledHTTPProvider, RpcEndpointPool
+from .rules import RuleEngine
+from .scheduler import UplinkScheduler
+from .sensors import SensorBus
+from .transport import AsyncHttp2Transport, Http2Transport, RequestsTransport
 from .version import __version__
 
-__all__ = ["AgentHub", "__version__"]
+__all__ = ["AgentHub", "encode_series", "decode_series", "UplinkScheduler",
+           "RuleEngine", "RequestsTransport", "Http2Transport", "AsyncHttp2Transport",
+           "RpcEndpointPool", "PooledHTTPProvider", "SensorBus", "__version__"]
 
@@ -3,14 +3,20 @@ AgentHub IoT Client
 Cliente principal para interactuar con AgentHub Protocol desde dispositivos IoT
 """
 
+import asyncio
 import json
+import os
 import time
 import requests
-from typing import Dict, Optional, Any
+from typing import Dict, Optional, Any, Iterable, Sequence, Tuple
 from eth_account import Account
 from web3 import Web3
 import hashlib
 
+from .compression import CONTENT_TYPE as SERIES_CONTENT_TYPE, encode_series
+from .presign import PresignPool
+from .rpc import PooledHTTPProvider, RpcEndpointPool
+
 
 class AgentHub:
     """AgentHub client for IoT devices"""
@@ -33,7 +39,11 @@ class AgentHub:
         private_key: str,
         network: str = "fuji",
         registry_address: Optional[str] = None,
-        rpc_url: Optional[str] = None
+        rpc_url: Optional[str] = None,
+        transport: Optional[Any] = None,
+        async_transport: Optional[Any] = None,
+        rpc_urls: Optional[Sequence[str]] = None,
+        hedge_reads: bool = False
     ):
         """
         Initialize AgentHub client
@@ -44,6 +54,10 @@ class AgentHub:
             network: Network to use ("fuji" or "mainnet")
             registry_address: AgentRegistry contract address (optional)
             rpc_url: Custom RPC URL (optional)
+            transport: Shared HTTP transport, e.g. Http2Transport (optional)
+            async_transport: Shared asyncio transport for the *_async methods (optional)
+            rpc_urls: Several RPC URLs to pool with failover (optional, overrides rpc_url)
+            hedge_reads: Hedge slow idempotent reads across rpc_urls
         """
         self.agent_id = agent_id
         self.network = network
@@ -55,19 +69,33 @@ class AgentHub:
         self.account = Account.from_key(private_key)
         
         # Configurar RPC
-        if rpc_url:
+        if rpc_urls:
+            self.rpc_url = rpc_urls[0]
+        elif rpc_url:
             self.rpc_url = rpc_url
         elif network == "mainnet":
             self.rpc_url = self.MAINNET_RPC
         else:
             self.rpc_url = self.FUJI_RPC
         
-        # Inicializar Web3
-        self.web3 = Web3(Web3.HTTPProvider(self.rpc_url))
+        # Inicializar Web3 (con varios nodos, a través del pool)
+        self.rpc_pool: Optional[RpcEndpointPool] = None
+        if rpc_urls:
+            self.rpc_pool = RpcEndpointPool(rpc_urls, hedge_reads=hedge_reads)
+            self.web3 = Web3(PooledHTTPProvider(self.rpc_pool))
+        else:
+            self.web3 = Web3(Web3.HTTPProvider(self.rpc_url))
         
         # Dirección del registro (configurar según deployment)
         self.registry_address = registry_address or "0x..."
         
+        # Transportes HTTP (ver agenthub_iot.transport); sin transporte se usa requests.post
+        self.transport = transport
+        self.async_transport = async_transport
+        
+        # Pool de pagos pre-firmados (ver start_presigning)
+        self._presign_pool: Optional[PresignPool] = None
+        
         self.initialized = True
     
     def _hash_agent_id(self, agent_id: str) -> str:
@@ -95,12 +123,28 @@ class AgentHub:
         }
         
         try:
+            if self.rpc_pool is not None:
+                return self.rpc_pool.request(method, params)
             response = requests.post(self.rpc_url, json=payload, timeout=10)
             response.raise_for_status()
             return response.json()
         except Exception as e:
             return {"error": str(e)}
     
+    def _post(self, url: str, **kwargs: Any) -> Any:
+        """POST por el transporte configurado o requests.post"""
+        if self.transport is not None:
+            return self.transport.post(url, **kwargs)
+        return requests.post(url, **kwargs)
+    
+    def _response_result(self, response: Any) -> Dict[str, Any]:
+        """Resultado estándar a partir de una respuesta HTTP"""
+        return {
+            "success": response.status_code == 200,
+            "status": response.status_code,
+            "data": response.json() if response.headers.get("content-type", "").startswith("application/json") else response.text
+        }
+    
     def register_agent(
         self,
         metadata_ipfs: str,
@@ -161,6 +205,55 @@ class AgentHub:
         except Exception as e:
             return {"error": str(e), "success": False}
     
+    def _build_payment_header(self, url: str, amount: str, token: str, tier: str) -> str:
+        """Generar y firmar la cabecera x-payment"""
+        timestamp = int(time.time() * 1000)
+        message = f"{url}{amount}{timestamp}"
+        signature = self._sign_message(message)
+        
+        payment_data = {
+            "resourceUrl": url,
+            "amount": amount,
+            "token": token,
+            "tier": tier,
+            "timestamp": timestamp,
+            "signature": signature,
+            "agentId": self.agent_id
+        }
+        return json.dumps(payment_data)
+    
+    def start_presigning(
+        self,
+        endpoints: Iterable[Tuple[str, str, str, str]],
+        pool_size: int = 4,
+        max_age: float = 30.0
+    ) -> PresignPool:
+        """
+        Pre-firmar pagos x402 en segundo plano
+        
+        x402_request toma una autorización del pool cuando url, amount, token
+        y tier coinciden con un endpoint configurado.
+        
+        Args:
+            endpoints: Tuplas (url, amount, token, tier)
+            pool_size: Autorizaciones mantenidas por endpoint
+            max_age: Segundos de validez de cada autorización
+        
+        Returns:
+            PresignPool en ejecución
+        """
+        self.stop_presigning()
+        self._presign_pool = PresignPool(
+            self, endpoints, pool_size=pool_size, max_age=max_age
+        ).start()
+        return self._presign_pool
+    
+    def stop_presigning(self) -> None:
+        """Detener el pool de pagos pre-firmados"""
+        if self._presign_pool is not None:
+            self._presign_pool.stop()
+            self._presign_pool = None
+    
     def x402_request(
         self,
         url: str,
@@ -186,48 +279,90 @@ class AgentHub:
             return {"error": "AgentHub not initialized"}
         
         try:
-            # Generar datos de pago
-            timestamp = int(time.time() * 1000)
-            message = f"{url}{amount}{timestamp}"
-            signature = self._sign_message(message)
-            
-            payment_data = {
-                "resourceUrl": url,
-                "amount": amount,
-                "token": token,
-                "tier": tier,
-                "timestamp": timestamp,
-                "signature": signature,
-                "agentId": self.agent_id
-            }
-            
-            # Headers
-            headers = {
-                "Content-Type": "application/json",
-                "x-payment": json.dumps(payment_data)
-            }
+            headers = self._x402_headers(url, amount, token, tier)
             
             # Body
             body = json.dumps(data) if data else "{}"
             
             # Hacer petición
-            response = requests.post(
+            response = self._post(
                 url,
                 headers=headers,
                 data=body,
                 timeout=30
             )
             
-            return {
-                "success": response.status_code == 200,
-                "status": response.status_code,
-                "data": response.json() if response.headers.get("content-type", "").startswith("application/json") else response.text,
-                "headers": dict(response.headers)
-            }
+            result = self._response_result(response)
+            result["headers"] = dict(response.headers)
+            return result
+            
+        except Exception as e:
+            return {"error": str(e), "success": False}
+    
+    async def x402_request_async(
+        self,
+        url: str,
+        amount: str,
+        data: Optional[Dict[str, Any]] = None,
+        token: str = "USDC",
+        tier: str = "basic"
+    ) -> Dict[str, Any]:
+        """
+        Versión asyncio de x402_request (requiere async_transport)
+        
+        Usa una autorización de start_presigning si la hay; si no, la firma
+        ECDSA se hace en el executor por defecto para no bloquear el bucle.
+        
+        Returns:
+            Dict con respuesta del servidor
+        """
+        if not self.initialized:
+            return {"error": "AgentHub not initialized"}
+        if self.async_transport is None:
+            return {"error": "async_transport not configured", "success": False}
+        
+        try:
+            payment_header = self._take_presigned(url, amount, token, tier)
+            if payment_header is None:
+                payment_header = await asyncio.get_running_loop().run_in_executor(
+                    None, self._build_payment_header, url, amount, token, tier
+                )
+            headers = self._payment_headers(payment_header)
+            body = json.dumps(data) if data else "{}"
+            
+            response = await self.async_transport.post(
+                url,
+                headers=headers,
+                data=body,
+                timeout=30
+            )
+            
+            result = self._response_result(response)
+            result["headers"] = dict(response.headers)
+            return result
             
         except Exception as e:
             return {"error": str(e), "success": False}
     
+    def _x402_headers(self, url: str, amount: str, token: str, tier: str) -> Dict[str, str]:
+        """Headers de una petición x402"""
+        # Usar una autorización pre-firmada si hay pool; si no, firmar ahora
+        payment_header = self._take_presigned(url, amount, token, tier)
+        if payment_header is None:
+            payment_header = self._build_payment_header(url, amount, token, tier)
+        return self._payment_headers(payment_header)
+    
+    def _take_presigned(self, url: str, amount: str, token: str, tier: str) -> Optional[str]:
+        if self._presign_pool is None:
+            return None
+        return self._presign_pool.take(url, amount, token, tier)
+    
+    def _payment_headers(self, payment_header: str) -> Dict[str, str]:
+        return {
+            "Content-Type": "application/json",
+            "x-payment": payment_header
+        }
+    
     def send_sensor_data(
         self,
         endpoint: str,
@@ -252,22 +387,131 @@ class AgentHub:
                 "X-Agent-ID": self.agent_id
             }
             
-            response = requests.post(
+            response = self._post(
                 endpoint,
                 headers=headers,
                 json=data,
                 timeout=10
             )
             
-            return {
-                "success": response.status_code == 200,
-                "status": response.status_code,
-                "data": response.json() if response.headers.get("content-type", "").startswith("application/json") else response.text
-            }
+            return self._response_result(response)
             
         except Exception as e:
             return {"error": str(e), "success": False}
     
+    async def send_sensor_data_async(
+        self,
+        endpoint: str,
+        data: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """
+        Versión asyncio de send_sensor_data (requiere async_transport)
+        
+        Returns:
+            Dict con respuesta del servidor
+        """
+        if not self.initialized:
+            return {"error": "AgentHub not initialized"}
+        if self.async_transport is None:
+            return {"error": "async_transport not configured", "success": False}
+        
+        try:
+            headers = {
+                "Content-Type": "application/json",
+                "X-Agent-ID": self.agent_id
+            }
+            
+            response = await self.async_transport.post(
+                endpoint,
+                headers=headers,
+                json=data,
+                timeout=10
+            )
+            
+            return self._response_result(response)
+            
+        except Exception as e:
+            return {"error": str(e), "success": False}
+
+    def send_sensor_series(
+        self,
+        endpoint: str,
+        timestamps: Sequence[int],
+        values: Sequence[float],
+        sensor: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Enviar un lote de lecturas comprimido (timestamp, valor)
+
+        Las lecturas se codifican con agenthub_iot.compression y se envían
+        como application/x-agenthub-series: el endpoint debe decodificarlas
+        con decode_series. SENSORS_API solo acepta JSON, no sirve aquí.
+
+        Args:
+            endpoint: URL del endpoint
+            timestamps: Timestamps enteros de las lecturas (ms)
+            values: Valores de las lecturas
+            sensor: Tipo de sensor (opcional)
+
+        Returns:
+            Dict con respuesta del servidor
+        """
+        if not self.initialized:
+            return {"error": "AgentHub not initialized"}
+
+        try:
+            payload = encode_series(timestamps, values)
+        except Exception as e:
+            return {"error": str(e), "success": False}
+        return self.send_series_payload(endpoint, payload, len(timestamps), sensor=sensor)
+
+    def send_series_payload(
+        self,
+        endpoint: str,
+        payload: bytes,
+        points: int,
+        sensor: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Enviar un lote ya codificado con encode_series
+
+        El endpoint debe decodificar el cuerpo con decode_series.
+
+        Args:
+            endpoint: URL del endpoint
+            payload: Bytes devueltos por encode_series
+            points: Número de lecturas del lote
+            sensor: Tipo de sensor (opcional)
+
+        Returns:
+            Dict con respuesta del servidor
+        """
+        if not self.initialized:
+            return {"error": "AgentHub not initialized"}
+
+        try:
+            headers = {
+                "Content-Type": SERIES_CONTENT_TYPE,
+                "X-Agent-ID": self.agent_id
+            }
+            if sensor:
+                headers["X-Sensor-Type"] = sensor
+
+            response = self._post(
+                endpoint,
+                headers=headers,
+                data=payload,
+                timeout=10
+            )
+
+            result = self._response_result(response)
+            result["points"] = points
+            result["bytes"] = len(payload)
+            return result
+
+        except Exception as e:
+            return {"error": str(e), "success": False}
+
     def get_agent_id(self) -> str:
         """Obtener ID del agente"""
         return self.agent_id
@@ -0,0 +1,257 @@
+"""
+AgentHub IoT Series Compression
+Codec columnar estilo Gorilla para series (timestamp, valor) de sensores
+
+Los timestamps (enteros, en ms) se codifican con delta-of-delta y los valores
+(float64) con XOR respecto al valor anterior. En series regulares la mayoría
+de los puntos ocupan pocos bits, frente a decenas de bytes en JSON.
+
+Formato del payload:
+    [1 byte versión][4 bytes número de puntos, big-endian][bitstream]
+"""
+
+import math
+import struct
+from typing import List, Sequence, Tuple
+
+# Content-Type usado al subir series codificadas
+CONTENT_TYPE = "application/x-agenthub-series"
+FORMAT_VERSION = 1
+
+_HEADER = struct.Struct(">BI")
+_MASK64 = (1 << 64) - 1
+_INT64_MIN = -(1 << 63)
+_INT64_MAX = (1 << 63) - 1
+
+# Buckets delta-of-delta: (prefijo, bits del prefijo, bits del valor)
+_DOD_BUCKETS = (
+    (0b10, 2, 7),
+    (0b110, 3, 9),
+    (0b1110, 4, 12),
+)
+_DOD_FALLBACK = (0b1111, 4, 64)
+
+
+class _BitWriter:
+    """Escritor de bits MSB-first sobre un bytearray"""
+
+    __slots__ = ("buffer", "_acc", "_nbits")
+
+    def __init__(self):
+        self.buffer = bytearray()
+        self._acc = 0
+        self._nbits = 0
+
+    def write(self, value: int, nbits: int) -> None:
+        self._acc = (self._acc << nbits) | value
+        self._nbits += nbits
+        if self._nbits >= 64:
+            self._nbits -= 64
+            self.buffer += (self._acc >> self._nbits).to_bytes(8, "big")
+            self._acc &= (1 << self._nbits) - 1
+
+    def getvalue(self) -> bytes:
+        tail = self._nbits
+        if tail:
+            pad = -tail % 8
+            self.buffer += (self._acc << pad).to_bytes((tail + pad) // 8, "big")
+        self._acc = 0
+        self._nbits = 0
+        return bytes(self.buffer)
+
+
+class _BitReader:
+    """Lector de bits MSB-first sobre bytes"""
+
+    __slots__ = ("_data", "_pos", "_limit")
+
+    def __init__(self, data: bytes, offset: int = 0):
+        self._data = data
+        self._pos = offset * 8
+        self._limit = len(data) * 8
+
+    def read(self, nbits: int) -> int:
+        pos = self._pos
+        end = pos + nbits
+        if end > self._limit:
+            raise ValueError("Truncated series payload")
+        start_byte = pos >> 3
+        end_byte = (end + 7) >> 3
+        chunk = int.from_bytes(self._data[start_byte:end_byte], "big")
+        self._pos = end
+        return (chunk >> ((end_byte << 3) - end)) & ((1 << nbits) - 1)
+
+
+def _to_signed(value: int, nbits: int) -> int:
+    """Interpretar value como entero con signo en complemento a dos"""
+    if value >> (nbits - 1):
+        return value - (1 << nbits)
+    return value
+
+
+def _float_bits(values: Sequence[float]) -> Tuple[int, ...]:
+    count = len(values)
+    return struct.unpack(f">{count}Q", struct.pack(f">{count}d", *values))
+
+
+def encode_series(timestamps: Sequence[int], values: Sequence[float]) -> bytes:
+    """
+    Codificar una serie (timestamp, valor)
+
+    Args:
+        timestamps: Timestamps enteros (p. ej. ms desde epoch), en cualquier orden
+        values: Valores float, uno por timestamp
+
+    Returns:
+        Payload binario decodificable con decode_series
+    """
+    count = len(timestamps)
+    if count != len(values):
+        raise ValueError("timestamps and values must have the same length")
+    if count > 0xFFFFFFFF:
+        raise ValueError("Series too long")
+
+    writer = _BitWriter()
+    write = writer.write
+    writer.buffer += _HEADER.pack(FORMAT_VERSION, count)
+    if count == 0:
+        return writer.getvalue()
+
+    bits = _float_bits(values)
+
+    prev_ts = int(timestamps[0])
+    if not _INT64_MIN <= prev_ts <= _INT64_MAX:
+        raise ValueError("Timestamps must fit in a signed 64-bit integer")
+    prev_bits = bits[0]
+    write(prev_ts & _MASK64, 64)
+    write(prev_bits, 64)
+
+    prev_delta = 0
+    prev_leading = -1
+    prev_trailing = 0
+
+    for i in range(1, count):
+        # Timestamp: delta-of-delta
+        ts = int(timestamps[i])
+        if not _INT64_MIN <= ts <= _INT64_MAX:
+            raise ValueError("Timestamps must fit in a signed 64-bit integer")
+        delta = ts - prev_ts
+        dod = delta - prev_delta
+        prev_ts = ts
+        prev_delta = delta
+
+        if dod == 0:
+            write(0, 1)
+        else:
+            for prefix, prefix_bits, value_bits in _DOD_BUCKETS:
+                limit = 1 << (value_bits - 1)
+                if -limit <= dod < limit:
+                    write(prefix, prefix_bits)
+                    write(dod & ((1 << value_bits) - 1), value_bits)
+                    break
+            else:
+                prefix, prefix_bits, value_bits = _DOD_FALLBACK
+                write(prefix, prefix_bits)
+                write(dod & _MASK64, value_bits)
+
+        # Valor: XOR con el anterior
+        current = bits[i]
+        xor = current ^ prev_bits
+        prev_bits = current
+
+        if xor == 0:
+            write(0, 1)
+            continue
+
+        leading = 64 - xor.bit_length()
+        trailing = (xor & -xor).bit_length() - 1
+        if leading > 31:
+            leading = 31
+
+        if prev_leading >= 0 and leading >= prev_leading and trailing >= prev_trailing:
+            # Reutilizar la ventana de bits significativos anterior
+            meaningful = 64 - prev_leading - prev_trailing
+            write(0b10, 2)
+            write(xor >> prev_trailing, meaningful)
+        else:
+            meaningful = 64 - leading - trailing
+            write(0b11, 2)
+            write(leading, 5)
+            write(meaningful - 1, 6)
+            write(xor >> trailing, meaningful)
+            prev_leading = leading
+            prev_trailing = trailing
+
+    return writer.getvalue()
+
+
+def decode_series(payload: bytes) -> Tuple[List[int], List[float]]:
+    """
+    Decodificar un payload generado por encode_series
+
+    Args:
+        payload: Bytes codificados
+
+    Returns:
+        Tupla (timestamps, values)
+    """
+    if len(payload) < _HEADER.size:
+        raise ValueError("Truncated series payload")
+    version, count = _HEADER.unpack_from(payload)
+    if version != FORMAT_VERSION:
+        raise ValueError(f"Unsupported series format version: {version}")
+    if count == 0:
+        return [], []
+
+    reader = _BitReader(payload, _HEADER.size)
+    read = reader.read
+
+    prev_ts = _to_signed(read(64), 64)
+    prev_bits = read(64)
+    timestamps = [prev_ts]
+    bits = [prev_bits]
+
+    prev_delta = 0
+    prev_leading = 0
+    prev_trailing = 0
+
+    for _ in range(1, count):
+        # Timestamp
+        if read(1) == 0:
+            dod = 0
+        elif read(1) == 0:
+            dod = _to_signed(read(7), 7)
+        elif read(1) == 0:
+            dod = _to_signed(read(9), 9)
+        elif read(1) == 0:
+            dod = _to_signed(read(12), 12)
+        else:
+            dod = _to_signed(read(64), 64)
+        # Aritmética módulo 2**64, igual que int64 en el lado del encoder
+        prev_delta = _to_signed((prev_delta + dod) & _MASK64, 64)
+        prev_ts = _to_signed((prev_ts + prev_delta) & _MASK64, 64)
+        timestamps.append(prev_ts)
+
+        # Valor
+        if read(1) == 1:
+            if read(1) == 1:
+                prev_leading = read(5)
+                meaningful = read(6) + 1
+                prev_trailing = 64 - prev_leading - meaningful
+                if prev_trailing < 0:
+                    raise ValueError("Corrupted series payload")
+            else:
+                meaningful = 64 - prev_leading - prev_trailing
+            prev_bits ^= read(meaningful) << prev_trailing
+        bits.append(prev_bits)
+
+    values = list(struct.unpack(f">{count}d", struct.pack(f">{count}Q", *bits)))
+    return timestamps, values
+
+
+def bytes_per_point(payload: bytes) -> float:
+    """Tamaño medio por punto de un payload codificado"""
+    if len(payload) < _HEADER.size:
+        raise ValueError("Truncated series payload")
+    _, count = _HEADER.unpack_from(payload)
+    return len(payload) / count if count else math.nan
@@ -0,0 +1,365 @@
+"""
+AgentHub IoT Load Generator
+Simula miles de dispositivos AgentHub contra la API para planificar capacidad
+
+Cada dispositivo virtual es un cliente AgentHub con su propia identidad
+(clave derivada de forma determinista de un prefijo y su índice). Las
+lecturas se planifican en lazo abierto a la tasa configurada: la latencia se
+mide desde el instante planificado, de modo que la cola de envío acumulada
+cuando el servidor no da abasto también cuenta.
+
+Uso:
+    agenthub-iot-loadgen --devices 1000 --rate 0.5 --duration 60
+    agenthub-iot-loadgen --url http://localhost:3000 --alert-ratio 0.05
+    agenthub-iot-loadgen --url http://gateway:8080 --http2 --h2c
+"""
+
+import argparse
+import hashlib
+import json
+import math
+import random
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from .client import AgentHub
+from .standin import ALERTS_PATH, SENSORS_PATH, StandinServer
+from .transport import Http2Transport, RequestsTransport
+
+PAYLOAD_SHAPES = ("reading", "batch", "series")
+
+
+def device_key(prefix: str, index: int) -> str:
+    """Clave privada determinista del dispositivo index"""
+    return "0x" + hashlib.sha256(f"{prefix}-{index}".encode("utf-8")).hexdigest()
+
+
+def make_devices(count: int, prefix: str = "loadgen", **kwargs: Any) -> List[AgentHub]:
+    """Crear las identidades de los dispositivos virtuales"""
+    return [
+        AgentHub(f"{prefix}-{index:05d}", device_key(prefix, index), **kwargs)
+        for index in range(count)
+    ]
+
+
+def _percentile(ordered: Sequence[float], fraction: float) -> float:
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, int(fraction * (len(ordered) - 1) + 0.5))]
+
+
+class _Recorder:
+    """Resultados por intervalo y acumulados"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._interval: List[float] = []
+        self._interval_errors = 0
+        self.latencies: List[float] = []
+        self.errors = 0
+        self.by_kind: Dict[str, int] = {}
+
+    def record(self, kind: str, latency: float, ok: bool) -> None:
+        with self._lock:
+            self._interval.append(latency)
+            self.latencies.append(latency)
+            self.by_kind[kind] = self.by_kind.get(kind, 0) + 1
+            if not ok:
+                self._interval_errors += 1
+                self.errors += 1
+
+    def drain(self) -> Dict[str, Any]:
+        with self._lock:
+            latencies, errors = self._interval, self._interval_errors
+            self._interval, self._interval_errors = [], 0
+        return _summary(latencies, errors)
+
+
+def _summary(latencies: List[float], errors: int) -> Dict[str, Any]:
+    ordered = sorted(latencies)
+    count = len(ordered)
+    return {
+        "requests": count,
+        "errors": errors,
+        "error_rate": errors / count if count else 0.0,
+        "p50_ms": _percentile(ordered, 0.50) * 1000,
+        "p95_ms": _percentile(ordered, 0.95) * 1000,
+        "p99_ms": _percentile(ordered, 0.99) * 1000,
+        "max_ms": ordered[-1] * 1000 if ordered else 0.0,
+    }
+
+
+class _PayloadFactory:
+    """Genera lecturas de temperatura con la forma de payload elegida"""
+
+    def __init__(self, shape: str, batch_size: int, seed: int):
+        if shape not in PAYLOAD_SHAPES:
+            raise ValueError(f"Unknown payload shape: {shape}")
+        self.shape = shape
+        self.batch_size = batch_size
+        self._local = threading.local()
+        self._seed = seed
+
+    def _rng(self) -> random.Random:
+        rng = getattr(self._local, "rng", None)
+        if rng is None:
+            rng = self._local.rng = random.Random(f"{self._seed}-{threading.get_ident()}")
+        return rng
+
+    def temperature(self, index: int, now: float) -> float:
+        base = 21.0 + (index % 7) + 3.0 * math.sin(now / 600.0 + index)
+        return round((base + self._rng().gauss(0, 0.05)) / 0.0625) * 0.0625
+
+    def send(self, device: AgentHub, index: int, endpoint: str) -> Dict[str, Any]:
+        now = time.time()
+        if self.shape == "reading":
+            return device.send_sensor_data(endpoint, {
+                "sensorType": "temperature",
+                "value": self.temperature(index, now),
+                "unit": "C",
+                "timestamp": int(now * 1000),
+            })
+
+        count = self.batch_size
+        timestamps = [int((now - (count - 1 - i)) * 1000) for i in range(count)]
+        values = [self.temperature(index, t / 1000) for t in timestamps]
+        if self.shape == "batch":
+            return device.send_sensor_data(endpoint, {
+                "sensorType": "temperature",
+                "unit": "C",
+                "readings": [{"timestamp": t, "value": v} for t, v in zip(timestamps, values)],
+            })
+        return device.send_sensor_series(endpoint, timestamps, values, sensor="temperature")
+
+
+def run_load(
+    devices: Sequence[AgentHub],
+    base_url: str,
+    rate: float,
+    duration: float,
+    alert_ratio: float = 0.0,
+    shape: str = "reading",
+    batch_size: int = 10,
+    workers: int = 64,
+    interval: float = 5.0,
+    amount: str = "0.0001",
+    seed: int = 0,
+    on_interval: Optional[Callable[[Dict[str, Any]], None]] = None,
+    series_path: str = SENSORS_PATH
+) -> Dict[str, Any]:
+    """
+    Generar carga en lazo abierto
+
+    Args:
+        devices: Clientes AgentHub simulados
+        base_url: URL base de la API (sin /api/...)
+        rate: Lecturas por segundo y dispositivo
+        duration: Segundos de prueba
+        alert_ratio: Fracción de envíos que son alertas x402
+        shape: Forma del payload ("reading", "batch" o "series")
+        batch_size: Lecturas por envío en "batch" y "series"
+        workers: Peticiones concurrentes máximas
+        interval: Segundos entre informes intermedios
+        amount: Pago x402 por alerta
+        seed: Semilla para reproducibilidad
+        on_interval: Callback con el resumen de cada intervalo
+        series_path: Ruta de los lotes "series"; debe decodificarlos con
+            decode_series (la ruta de sensores de la app solo acepta JSON)
+
+    Returns:
+        Resumen final (throughput, errores, percentiles de latencia)
+    """
+    if not devices:
+        raise ValueError("At least one device is required")
+    if rate <= 0 or duration <= 0:
+        raise ValueError("rate and duration must be positive")
+
+    sensors_url = base_url.rstrip("/") + (series_path if shape == "series" else SENSORS_PATH)
+    alerts_url = base_url.rstrip("/") + ALERTS_PATH
+    payloads = _PayloadFactory(shape, batch_size, seed)
+    recorder = _Recorder()
+    rng = random.Random(seed)
+
+    total_rate = rate * len(devices)
+    total_events = int(total_rate * duration)
+
+    def send(index: int, scheduled: float, is_alert: bool) -> None:
+        device = devices[index]
+        try:
+            if is_alert:
+                result = device.x402_request(alerts_url, amount, {
+                    "alert": "high_temperature",
+                    "temperature": payloads.temperature(index, time.time()),
+                    "timestamp": int(time.time() * 1000),
+                })
+            else:
+                result = payloads.send(device, index, sensors_url)
+            ok = bool(result.get("success"))
+        except Exception:
+            ok = False
+        recorder.record("alert" if is_alert else shape, time.perf_counter() - scheduled, ok)
+
+    stop_reporting = threading.Event()
+    start = time.perf_counter()
+
+    def report() -> None:
+        last = start
+        while not stop_reporting.wait(interval):
+            now = time.perf_counter()
+            summary = recorder.drain()
+            summary["elapsed"] = now - start
+            summary["throughput"] = summary["requests"] / (now - last)
+            last = now
+            if on_interval is not None:
+                on_interval(summary)
+
+    reporter = threading.Thread(target=report, name="agenthub-loadgen-report", daemon=True)
+    reporter.start()
+
+    with ThreadPoolExecutor(workers) as pool:
+        for event in range(total_events):
+            scheduled = start + event / total_rate
+            delay = scheduled - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            pool.submit(send, event % len(devices), scheduled, rng.random() < alert_ratio)
+
+    elapsed = time.perf_counter() - start
+    stop_reporting.set()
+    reporter.join()
+
+    summary = _summary(recorder.latencies, recorder.errors)
+    summary.update({
+        "elapsed": elapsed,
+        "devices": len(devices),
+        "offered_rate": total_rate,
+        "throughput": summary["requests"] / elapsed if elapsed else 0.0,
+        "by_kind": dict(recorder.by_kind),
+    })
+    return summary
+
+
+def _format_interval(summary: Dict[str, Any]) -> str:
+    return (f"[{summary['elapsed']:7.1f}s] {summary['throughput']:8.1f} req/s  "
+            f"errores {summary['error_rate'] * 100:5.1f}%  "
+            f"p50 {summary['p50_ms']:7.1f} ms  p95 {summary['p95_ms']:7.1f} ms  "
+            f"p99 {summary['p99_ms']:7.1f} ms")
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="agenthub-iot-loadgen",
+        description="Simular dispositivos AgentHub IoT contra la API de ingesta"
+    )
+    parser.add_argument("--url", help="URL base de la API (por defecto un stand-in local)")
+    parser.add_argument("--devices", type=int, default=100, help="dispositivos virtuales")
+    parser.add_argument("--rate", type=float, default=1.0, help="envíos por segundo y dispositivo")
+    parser.add_argument("--duration", type=float, default=30.0, help="segundos de prueba")
+    parser.add_argument("--alert-ratio", type=float, default=0.01,
+                        help="fracción de envíos que son alertas x402")
+    parser.add_argument("--payload", choices=PAYLOAD_SHAPES, default="reading",
+                        help="forma del payload de sensores")
+    parser.add_argument("--batch-size", type=int, default=10,
+                        help="lecturas por envío en batch/series")
+    parser.add_argument("--series-path", default=SENSORS_PATH,
+                        help="ruta de los lotes series (debe decodificarlos con decode_series)")
+    parser.add_argument("--workers", type=int, default=64, help="peticiones concurrentes")
+    parser.add_argument("--interval", type=float, default=5.0, help="segundos entre informes")
+    parser.add_argument("--http2", action="store_true", help="usar Http2Transport")
+    parser.add_argument("--h2c", action="store_true",
+                        help="con --http2, HTTP/2 sin TLS con prior knowledge en http://")
+    parser.add_argument("--connections", type=int,
+                        help="conexiones máximas al servidor "
+                             "(por defecto 4 con h2c y --workers en otro caso)")
+    parser.add_argument("--prefix", default="loadgen", help="prefijo de las identidades")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--standin-latency", type=float, default=0.0,
+                        help="latencia del stand-in local (s)")
+    parser.add_argument("--standin-error-rate", type=float, default=0.0,
+                        help="fracción de 503 del stand-in local")
+    parser.add_argument("--json", action="store_true", help="imprimir el resumen final en JSON")
+    return parser
+
+
+def make_transport(args: argparse.Namespace, base_url: str, builtin: bool = False) -> Any:
+    """
+    Transporte compartido por los dispositivos virtuales
+
+    Solo con h2c (prior knowledge) hay garantía de HTTP/2 y bastan pocas
+    conexiones multiplexadas. En cualquier otro caso el servidor puede acabar
+    hablando HTTP/1.1, así que el pool se dimensiona a --workers para que el
+    generador no mida su propia cola de conexiones.
+    """
+    # El stand-in h2 solo habla h2c con prior knowledge; un servidor externo
+    # por http:// (p. ej. Next.js) no, salvo que se pida --h2c
+    http = base_url.startswith("http://")
+    h2c = args.http2 and http and (builtin or args.h2c)
+    if h2c:
+        return Http2Transport(max_connections=args.connections or 4, http1=False)
+
+    connections = args.connections or args.workers
+    if args.http2 and not http:
+        # https://: HTTP/2 si el servidor lo negocia por ALPN, si no HTTP/1.1
+        return Http2Transport(max_connections=connections, http1=True)
+    # http:// sin h2c nunca llega a HTTP/2
+    return RequestsTransport(pool_maxsize=connections)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """Punto de entrada de agenthub-iot-loadgen"""
+    args = build_parser().parse_args(argv)
+
+    server: Any = None
+    base_url = args.url
+    if base_url is None:
+        if args.http2:
+            from .standin import H2StandinServer
+            server = H2StandinServer(latency=args.standin_latency, error_rate=args.standin_error_rate)
+        else:
+            server = StandinServer(latency=args.standin_latency, error_rate=args.standin_error_rate)
+        server.start()
+        base_url = server.url
+
+    transport = make_transport(args, base_url, builtin=server is not None)
+
+    log = sys.stderr if args.json else sys.stdout
+    try:
+        devices = make_devices(args.devices, args.prefix, transport=transport)
+        print(f"{args.devices} dispositivos -> {base_url} "
+              f"({args.devices * args.rate:.1f} envíos/s ofrecidos, payload {args.payload})",
+              file=log)
+        summary = run_load(
+            devices,
+            base_url,
+            rate=args.rate,
+            duration=args.duration,
+            alert_ratio=args.alert_ratio,
+            shape=args.payload,
+            batch_size=args.batch_size,
+            workers=args.workers,
+            interval=args.interval,
+            seed=args.seed,
+            series_path=args.series_path,
+            on_interval=lambda s: print(_format_interval(s), file=log, flush=True)
+        )
+    finally:
+        transport.close()
+        if server is not None:
+            server.stop()
+
+    if args.json:
+        print(json.dumps(summary, indent=2))
+    else:
+        print(f"Total: {summary['requests']} peticiones en {summary['elapsed']:.1f}s, "
+              f"{summary['throughput']:.1f} req/s (ofrecido {summary['offered_rate']:.1f}), "
+              f"errores {summary['error_rate'] * 100:.2f}%")
+        print(f"Latencia: p50 {summary['p50_ms']:.1f} ms, p95 {summary['p95_ms']:.1f} ms, "
+              f"p99 {summary['p99_ms']:.1f} ms, máx {summary['max_ms']:.1f} ms")
+    return 1 if summary["requests"] and summary["error_rate"] == 1.0 else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
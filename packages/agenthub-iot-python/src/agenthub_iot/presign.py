@@ -0,0 +1,164 @@
+"""
+AgentHub IoT Payment Pre-signing
+Pool de autorizaciones x402 pre-firmadas en segundo plano
+
+Firmar un pago (ECDSA) es la parte más lenta de x402_request en un
+dispositivo pequeño. El pool mantiene unas pocas cabeceras x-payment ya
+firmadas y serializadas para cada endpoint configurado; al enviar una alerta
+se toma una y la petición sale sin firmar en el camino crítico. Cada
+autorización se usa una sola vez y las que superan max_age se descartan y se
+regeneran.
+"""
+
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, Dict, Iterable, Optional, Tuple
+
+# (url, amount, token, tier)
+PaymentKey = Tuple[str, str, str, str]
+
+
+class PresignPool:
+    """Pool de cabeceras x-payment pre-firmadas"""
+
+    def __init__(
+        self,
+        agent: Any,
+        endpoints: Iterable[PaymentKey],
+        pool_size: int = 4,
+        max_age: float = 30.0,
+        refresh_interval: Optional[float] = None
+    ):
+        """
+        Inicializar pool
+
+        Args:
+            agent: Cliente AgentHub que firma los pagos
+            endpoints: Tuplas (url, amount, token, tier) a pre-firmar
+            pool_size: Autorizaciones mantenidas por endpoint
+            max_age: Segundos tras los que una autorización se considera caducada
+            refresh_interval: Segundos entre pasadas de refresco (por defecto max_age / 4)
+        """
+        if pool_size <= 0:
+            raise ValueError("pool_size must be positive")
+        if max_age <= 0:
+            raise ValueError("max_age must be positive")
+
+        self.agent = agent
+        self.pool_size = pool_size
+        self.max_age = max_age
+        self.refresh_interval = refresh_interval or max_age / 4
+        # El refresco renueva antes de caducar para que take() no quede vacío
+        self._refresh_age = max(max_age - self.refresh_interval, max_age / 2)
+
+        # Por endpoint: deque de (creado en, cabecera), de más antigua a más nueva
+        self._pools: Dict[PaymentKey, Deque[Tuple[float, str]]] = {
+            tuple(key): deque() for key in endpoints  # type: ignore[misc]
+        }
+        self._cond = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._running = False
+        # Se ha tomado o caducado alguna autorización desde el último refresco
+        self._dirty = False
+
+        self.hits = 0
+        self.misses = 0
+
+    def start(self) -> "PresignPool":
+        """Llenar el pool y arrancar el hilo de refresco"""
+        self.fill()
+        with self._cond:
+            if self._running:
+                return self
+            self._running = True
+            self._thread = threading.Thread(
+                target=self._run, name="agenthub-presign", daemon=True
+            )
+            self._thread.start()
+        return self
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """Detener el hilo de refresco"""
+        with self._cond:
+            self._running = False
+            self._cond.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def take(self, url: str, amount: str, token: str, tier: str) -> Optional[str]:
+        """
+        Tomar una cabecera x-payment pre-firmada
+
+        Returns:
+            Cabecera serializada, o None si no hay ninguna válida
+        """
+        key = (url, amount, token, tier)
+        with self._cond:
+            pool = self._pools.get(key)
+            if pool is None:
+                return None
+            self._expire(pool, time.time() - self.max_age)
+            if not pool:
+                self.misses += 1
+                self._dirty = True
+                self._cond.notify_all()
+                return None
+            _, header = pool.pop()
+            self.hits += 1
+            self._dirty = True
+            # Despertar al hilo para reponer la autorización usada
+            self._cond.notify_all()
+            return header
+
+    def available(self) -> Dict[PaymentKey, int]:
+        """Autorizaciones válidas por endpoint"""
+        now = time.time()
+        with self._cond:
+            for pool in self._pools.values():
+                self._expire(pool, now - self.max_age)
+            return {key: len(pool) for key, pool in self._pools.items()}
+
+    def fill(self) -> int:
+        """
+        Descartar caducadas y reponer hasta pool_size
+
+        Returns:
+            Número de autorizaciones firmadas
+        """
+        signed = 0
+        for key in list(self._pools):
+            while True:
+                with self._cond:
+                    pool = self._pools[key]
+                    self._expire(pool, time.time() - self._refresh_age)
+                    if len(pool) >= self.pool_size:
+                        break
+                # Firmar fuera del lock para no bloquear take()
+                created = time.time()
+                header = self.agent._build_payment_header(*key)
+                with self._cond:
+                    pool.append((created, header))
+                signed += 1
+        return signed
+
+    def _expire(self, pool: Deque[Tuple[float, str]], cutoff: float) -> None:
+        while pool and pool[0][0] < cutoff:
+            pool.popleft()
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                if not self._running:
+                    return
+                if not self._dirty:
+                    self._cond.wait(self.refresh_interval)
+                if not self._running:
+                    return
+                self._dirty = False
+            try:
+                self.fill()
+            except Exception:
+                # Reintentar en la siguiente pasada; x402_request firma en línea
+                pass
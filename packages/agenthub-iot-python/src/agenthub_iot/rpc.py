@@ -0,0 +1,344 @@
+"""
+AgentHub IoT RPC Endpoint Pool
+Pool de nodos RPC con selección por latencia, failover y lecturas hedged
+
+Cada endpoint lleva una EWMA de la latencia de sus respuestas correctas (y
+de su desviación) y otra de su tasa de éxito. Las peticiones van al endpoint
+sano con mejor puntuación (latencia / tasa de éxito); si falla, se pasa al
+siguiente. Un endpoint queda fuera durante un cooldown tras varios fallos
+seguidos o si su tasa de éxito cae por debajo de min_success_rate; después
+vuelve a probarse.
+
+Con hedge_reads=True, las lecturas idempotentes que tardan más que el umbral
+de cola (hedge_after, o latencia EWMA + 4 desviaciones) se lanzan también al
+siguiente endpoint y gana la primera respuesta. Las escrituras nunca se
+duplican y solo cambian de nodo cuando el nodo no aceptó la petición: errores
+de conexión o respuestas 429, 502 y 503.
+"""
+
+import itertools
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Dict, List, Optional, Sequence
+
+import requests
+from web3.providers.base import BaseProvider
+
+# Métodos de solo lectura que se pueden repetir o duplicar sin efectos
+READ_METHODS = frozenset({
+    "eth_blockNumber",
+    "eth_call",
+    "eth_chainId",
+    "eth_estimateGas",
+    "eth_feeHistory",
+    "eth_gasPrice",
+    "eth_getBalance",
+    "eth_getBlockByHash",
+    "eth_getBlockByNumber",
+    "eth_getCode",
+    "eth_getLogs",
+    "eth_getStorageAt",
+    "eth_getTransactionByHash",
+    "eth_getTransactionCount",
+    "eth_getTransactionReceipt",
+    "eth_maxPriorityFeePerGas",
+    "eth_syncing",
+    "net_version",
+    "web3_clientVersion",
+})
+
+# Retardo de hedge para un endpoint sin muestras de latencia
+_DEFAULT_HEDGE_DELAY = 0.25
+
+# Respuestas HTTP con las que el nodo no procesó la petición
+_NOT_ACCEPTED_STATUS = frozenset({429, 502, 503})
+
+
+class RpcError(Exception):
+    """Todos los endpoints RPC fallaron"""
+
+
+class RpcEndpoint:
+    """Estado de salud y latencia de un endpoint"""
+
+    def __init__(self, url: str):
+        self.url = url
+        self.latency: Optional[float] = None
+        self.deviation = 0.0
+        self.success_rate = 1.0
+        self.requests = 0
+        self.errors = 0
+        self.consecutive_failures = 0
+        self.down_until = 0.0
+
+    def score(self, unmeasured: float) -> float:
+        """
+        Latencia esperada / tasa de éxito (menor es mejor)
+
+        Args:
+            unmeasured: Latencia supuesta para un endpoint que ha fallado sin
+                haber respondido nunca bien (la peor observada en el pool)
+        """
+        if self.latency is not None:
+            latency = self.latency
+        elif self.errors:
+            latency = unmeasured
+        else:
+            # Nuevo: puntúa 0 para que se pruebe pronto
+            latency = 0.0
+        return latency / max(self.success_rate, 0.05)
+
+    def status(self, now: float) -> Dict[str, Any]:
+        return {
+            "url": self.url,
+            "healthy": now >= self.down_until,
+            "latency": self.latency,
+            "deviation": self.deviation,
+            "success_rate": self.success_rate,
+            "requests": self.requests,
+            "errors": self.errors,
+        }
+
+
+class RpcEndpointPool:
+    """Pool de endpoints JSON-RPC con failover y lecturas hedged"""
+
+    def __init__(
+        self,
+        urls: Sequence[str],
+        timeout: float = 10.0,
+        alpha: float = 0.3,
+        failure_threshold: int = 3,
+        cooldown: float = 30.0,
+        min_success_rate: float = 0.5,
+        hedge_reads: bool = False,
+        hedge_after: Optional[float] = None,
+        min_hedge_delay: float = 0.02,
+        session: Optional[requests.Session] = None
+    ):
+        """
+        Inicializar pool
+
+        Args:
+            urls: URLs de los nodos RPC
+            timeout: Timeout por petición (s)
+            alpha: Peso de la muestra nueva en las EWMA
+            failure_threshold: Fallos seguidos que sacan un endpoint de rotación
+            cooldown: Segundos fuera de rotación antes de volver a probarlo
+            min_success_rate: Tasa de éxito (EWMA) bajo la que un endpoint sale de rotación
+            hedge_reads: Duplicar lecturas lentas a un segundo endpoint
+            hedge_after: Umbral fijo de hedge (s); por defecto se deriva de la EWMA
+            min_hedge_delay: Umbral mínimo de hedge derivado (s)
+            session: Sesión HTTP a reutilizar (opcional)
+        """
+        if not urls:
+            raise ValueError("At least one RPC URL is required")
+        if not 0 < alpha <= 1:
+            raise ValueError("alpha must be in (0, 1]")
+        if not 0 <= min_success_rate < 1:
+            raise ValueError("min_success_rate must be in [0, 1)")
+
+        self.endpoints = [RpcEndpoint(url) for url in urls]
+        self.timeout = timeout
+        self.alpha = alpha
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.min_success_rate = min_success_rate
+        self.hedge_reads = hedge_reads
+        self.hedge_after = hedge_after
+        self.min_hedge_delay = min_hedge_delay
+        self.session = session or requests.Session()
+
+        self.hedges = 0
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    # Estado
+
+    def ranked(self) -> List[RpcEndpoint]:
+        """Endpoints en orden de preferencia: sanos por puntuación, luego caídos"""
+        now = time.monotonic()
+        with self._lock:
+            for endpoint in self.endpoints:
+                if endpoint.down_until and now >= endpoint.down_until:
+                    # Fin del cooldown: vuelve a rotación justo en el mínimo,
+                    # de modo que un nuevo fallo lo saca otra vez
+                    endpoint.down_until = 0.0
+                    endpoint.consecutive_failures = 0
+                    endpoint.success_rate = max(endpoint.success_rate, self.min_success_rate)
+            healthy = [e for e in self.endpoints if now >= e.down_until]
+            down = [e for e in self.endpoints if now < e.down_until]
+            measured = [e.latency for e in self.endpoints if e.latency is not None]
+            unmeasured = max(measured) if measured else self.timeout
+            healthy.sort(key=lambda e: e.score(unmeasured))
+            down.sort(key=lambda e: e.down_until)
+        return healthy + down
+
+    def status(self) -> List[Dict[str, Any]]:
+        """Estado de cada endpoint"""
+        now = time.monotonic()
+        with self._lock:
+            return [endpoint.status(now) for endpoint in self.endpoints]
+
+    def close(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+        self.session.close()
+
+    # Peticiones
+
+    def request(self, method: str, params: Optional[list] = None) -> Dict[str, Any]:
+        """
+        Enviar una petición JSON-RPC
+
+        Args:
+            method: Método RPC
+            params: Parámetros del método
+
+        Returns:
+            Respuesta JSON-RPC (incluidas las respuestas con "error" del nodo)
+
+        Raises:
+            RpcError: Si ningún endpoint respondió
+        """
+        payload = {
+            "jsonrpc": "2.0",
+            "method": method,
+            "params": params if params is not None else [],
+            "id": next(self._ids),
+        }
+        candidates = self.ranked()
+        is_read = method in READ_METHODS
+
+        if is_read and self.hedge_reads and len(candidates) > 1:
+            return self._hedged(candidates, payload)
+
+        errors = []
+        for endpoint in candidates:
+            try:
+                return self._call(endpoint, payload)
+            except Exception as e:
+                errors.append(f"{endpoint.url}: {e}")
+                # Una escritura solo cambia de nodo si este no la aceptó
+                if not is_read and not _not_accepted(e):
+                    break
+        raise RpcError("; ".join(errors))
+
+    def _hedged(self, candidates: List[RpcEndpoint], payload: Dict[str, Any]) -> Dict[str, Any]:
+        executor = self._get_executor()
+        remaining = iter(candidates)
+        first = next(remaining)
+        futures: Dict[Future, RpcEndpoint] = {executor.submit(self._call, first, payload): first}
+        delay: Optional[float] = self._hedge_delay(first)
+        errors = []
+
+        while futures:
+            done, _ = wait(list(futures), timeout=delay, return_when=FIRST_COMPLETED)
+            if not done:
+                # Umbral de cola superado: lanzar una copia al siguiente endpoint
+                endpoint = next(remaining, None)
+                if endpoint is None:
+                    delay = None
+                    continue
+                with self._lock:
+                    self.hedges += 1
+                futures[executor.submit(self._call, endpoint, payload)] = endpoint
+                continue
+
+            for future in done:
+                endpoint = futures.pop(future)
+                try:
+                    return future.result()
+                except Exception as e:
+                    errors.append(f"{endpoint.url}: {e}")
+                    # Failover inmediato al siguiente endpoint
+                    replacement = next(remaining, None)
+                    if replacement is not None:
+                        futures[executor.submit(self._call, replacement, payload)] = replacement
+        raise RpcError("; ".join(errors))
+
+    def _hedge_delay(self, endpoint: RpcEndpoint) -> float:
+        if self.hedge_after is not None:
+            return self.hedge_after
+        with self._lock:
+            if endpoint.latency is None:
+                return _DEFAULT_HEDGE_DELAY
+            return max(self.min_hedge_delay, endpoint.latency + 4 * endpoint.deviation)
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=max(4, 2 * len(self.endpoints)),
+                    thread_name_prefix="agenthub-rpc"
+                )
+            return self._executor
+
+    def _call(self, endpoint: RpcEndpoint, payload: Dict[str, Any]) -> Dict[str, Any]:
+        start = time.monotonic()
+        try:
+            response = self.session.post(endpoint.url, json=payload, timeout=self.timeout)
+            response.raise_for_status()
+            result = response.json()
+            if not isinstance(result, dict):
+                raise ValueError("Invalid JSON-RPC response")
+        except Exception:
+            self._record(endpoint, time.monotonic() - start, ok=False)
+            raise
+        self._record(endpoint, time.monotonic() - start, ok=True)
+        return result
+
+    def _record(self, endpoint: RpcEndpoint, elapsed: float, ok: bool) -> None:
+        alpha = self.alpha
+        with self._lock:
+            endpoint.requests += 1
+            endpoint.success_rate += alpha * ((1.0 if ok else 0.0) - endpoint.success_rate)
+
+            if ok:
+                # Solo las respuestas correctas cuentan para la latencia: un
+                # nodo que falla rápido no debe parecer rápido
+                if endpoint.latency is None:
+                    endpoint.latency = elapsed
+                    endpoint.deviation = elapsed / 2
+                else:
+                    endpoint.deviation += alpha * (abs(elapsed - endpoint.latency) - endpoint.deviation)
+                    endpoint.latency += alpha * (elapsed - endpoint.latency)
+                endpoint.consecutive_failures = 0
+                endpoint.down_until = 0.0
+            else:
+                endpoint.errors += 1
+                endpoint.consecutive_failures += 1
+                if (endpoint.consecutive_failures >= self.failure_threshold
+                        or endpoint.success_rate < self.min_success_rate):
+                    endpoint.down_until = time.monotonic() + self.cooldown
+
+
+def _not_accepted(error: Exception) -> bool:
+    """El nodo no aceptó la petición: es seguro reenviarla a otro"""
+    if isinstance(error, requests.ConnectionError):
+        return True
+    if isinstance(error, requests.HTTPError) and error.response is not None:
+        return error.response.status_code in _NOT_ACCEPTED_STATUS
+    return False
+
+
+class PooledHTTPProvider(BaseProvider):
+    """Provider de web3 que envía las peticiones a través de un RpcEndpointPool"""
+
+    def __init__(self, pool: RpcEndpointPool):
+        super().__init__()
+        self.pool = pool
+
+    def make_request(self, method: Any, params: Any) -> Any:
+        return self.pool.request(str(method), list(params) if params is not None else [])
+
+    def is_connected(self, show_traceback: bool = False) -> bool:
+        try:
+            return "result" in self.pool.request("eth_chainId", [])
+        except RpcError:
+            if show_traceback:
+                raise
+            return False
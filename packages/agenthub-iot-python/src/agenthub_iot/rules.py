@@ -0,0 +1,451 @@
+"""
+AgentHub IoT Edge Rules
+Motor de reglas compiladas para generar alertas localmente en el dispositivo
+
+Las reglas se declaran como diccionarios y se compilan una sola vez:
+
+    {"name": "high_temp", "sensor": "temperature", "type": "threshold",
+     "op": ">", "value": 30.0, "cooldown": 300}
+    {"name": "overheat", "sensor": "temperature", "type": "hysteresis",
+     "high": 30.0, "low": 28.0}
+    {"name": "fast_rise", "sensor": "temperature", "type": "rate",
+     "op": ">", "value": 0.05, "window": 60}
+    {"name": "sustained", "sensor": "temperature", "type": "window",
+     "agg": "min", "op": ">", "value": 29.0, "window": 300}
+
+Tipos:
+    threshold: valor actual comparado con value
+    hysteresis: dispara al cruzar high y se rearma al bajar de low
+        (con "direction": "below" dispara al bajar de low y se rearma sobre high)
+    rate: variación por segundo dentro de la ventana comparada con value
+    window: agregado (avg, min, max) de la ventana comparado con value;
+        solo se evalúa cuando la ventana está completa
+
+Campos comunes opcionales: cooldown (s), alert (nombre de la alerta),
+url, amount, tier y data (campos extra para el payload de la alerta).
+
+Con evaluate(..., source=id) cada fuente (p. ej. cada sonda de un mismo tipo
+de sensor) tiene su propia copia del estado de las reglas: ventanas,
+histéresis y cooldown no se mezclan entre fuentes.
+
+El cooldown empieza cuando la alerta se envía con éxito: si el envío falla,
+la regla vuelve a dispararse con la siguiente lectura que la cumpla.
+
+Los umbrales simples de un mismo sensor se agrupan en arrays ordenados y se
+resuelven con búsqueda binaria, de modo que miles de reglas cuestan
+O(log n + reglas disparadas) por lectura. Las ventanas con la misma duración
+se comparten entre reglas.
+"""
+
+import operator
+import time
+from bisect import bisect_left, bisect_right
+from collections import deque
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+_OPS: Dict[str, Callable[[float, float], bool]] = {
+    ">": operator.gt,
+    ">=": operator.ge,
+    "<": operator.lt,
+    "<=": operator.le,
+}
+
+_AGGREGATES = ("avg", "min", "max")
+
+
+class _CompiledRule:
+    __slots__ = (
+        "name", "sensor", "alert", "cooldown", "threshold", "url", "amount",
+        "tier", "data", "last_fired", "sending", "on_delivered",
+    )
+
+    def __init__(self, spec: Dict[str, Any], threshold: Optional[float]):
+        self.name = spec["name"]
+        self.sensor = spec["sensor"]
+        self.alert = spec.get("alert", self.name)
+        self.cooldown = float(spec.get("cooldown", 0.0))
+        self.threshold = threshold
+        self.url = spec.get("url")
+        self.amount = spec.get("amount")
+        self.tier = spec.get("tier")
+        self.data = spec.get("data")
+        self.last_fired = float("-inf")
+        # Alerta encolada en el scheduler pendiente de confirmación
+        self.sending = False
+        # Estado a consumir cuando la alerta se entrega (histéresis)
+        self.on_delivered: Optional[Callable[[], None]] = None
+
+    def ready(self, t: float) -> bool:
+        return not self.sending and t - self.last_fired >= self.cooldown
+
+    def delivered(self, t: float) -> None:
+        self.last_fired = max(self.last_fired, t)
+        if self.on_delivered is not None:
+            self.on_delivered()
+
+
+class _Window:
+    """Ventana deslizante por tiempo con suma y mín/máx monótonos"""
+
+    __slots__ = ("span", "samples", "total", "mins", "maxs", "first_seen")
+
+    def __init__(self, span: float):
+        self.span = span
+        self.samples: deque = deque()
+        self.total = 0.0
+        self.mins: deque = deque()
+        self.maxs: deque = deque()
+        self.first_seen: Optional[float] = None
+
+    def push(self, t: float, v: float) -> None:
+        if self.first_seen is None:
+            self.first_seen = t
+        self.samples.append((t, v))
+        self.total += v
+
+        mins = self.mins
+        while mins and mins[-1][1] >= v:
+            mins.pop()
+        mins.append((t, v))
+        maxs = self.maxs
+        while maxs and maxs[-1][1] <= v:
+            maxs.pop()
+        maxs.append((t, v))
+
+        cutoff = t - self.span
+        samples = self.samples
+        while samples[0][0] < cutoff:
+            self.total -= samples.popleft()[1]
+        while mins[0][0] < cutoff:
+            mins.popleft()
+        while maxs[0][0] < cutoff:
+            maxs.popleft()
+
+    def full(self, t: float) -> bool:
+        return self.first_seen is not None and t - self.first_seen >= self.span
+
+    def aggregate(self, agg: str) -> float:
+        if agg == "avg":
+            return self.total / len(self.samples)
+        if agg == "min":
+            return self.mins[0][1]
+        return self.maxs[0][1]
+
+    def rate(self) -> Optional[float]:
+        t0, v0 = self.samples[0]
+        t1, v1 = self.samples[-1]
+        if t1 <= t0:
+            return None
+        return (v1 - v0) / (t1 - t0)
+
+
+class _ThresholdGroup:
+    """Umbrales con el mismo operador, ordenados para búsqueda binaria"""
+
+    __slots__ = ("op", "values", "rules")
+
+    def __init__(self, op: str, entries: List[Tuple[float, _CompiledRule]]):
+        entries.sort(key=lambda entry: entry[0])
+        self.op = op
+        self.values = [value for value, _ in entries]
+        self.rules = [rule for _, rule in entries]
+
+    def matches(self, v: float) -> List[_CompiledRule]:
+        op = self.op
+        if op == ">":
+            return self.rules[:bisect_left(self.values, v)]
+        if op == ">=":
+            return self.rules[:bisect_right(self.values, v)]
+        if op == "<":
+            return self.rules[bisect_right(self.values, v):]
+        return self.rules[bisect_left(self.values, v):]
+
+
+class _SensorProgram:
+    """Reglas compiladas de un sensor"""
+
+    __slots__ = ("thresholds", "windows", "checks")
+
+    def __init__(self):
+        self.thresholds: List[_ThresholdGroup] = []
+        self.windows: List[_Window] = []
+        # (regla, check(t, v) -> valor observado o None)
+        self.checks: List[Tuple[_CompiledRule, Callable[[float, float], Optional[float]]]] = []
+
+
+def _require(spec: Dict[str, Any], *fields: str) -> None:
+    missing = [field for field in fields if field not in spec]
+    if missing:
+        raise ValueError(f"Rule {spec.get('name', '?')!r} missing fields: {', '.join(missing)}")
+
+
+def _op(spec: Dict[str, Any]) -> str:
+    op = spec.get("op", ">")
+    if op not in _OPS:
+        raise ValueError(f"Rule {spec['name']!r} has unknown op: {op}")
+    return op
+
+
+def _hysteresis_check(
+    spec: Dict[str, Any]
+) -> Tuple[Callable[[float, float], Optional[float]], Callable[[], None]]:
+    high = float(spec["high"])
+    low = float(spec["low"])
+    if low > high:
+        raise ValueError(f"Rule {spec['name']!r} needs low <= high")
+    below = spec.get("direction", "above") == "below"
+    state = {"armed": True}
+
+    def check(t: float, v: float) -> Optional[float]:
+        if below:
+            fire, rearm = v < low, v > high
+        else:
+            fire, rearm = v > high, v < low
+        # El cruce solo se consume al entregar la alerta (disarm); mientras
+        # tanto la regla sigue armada y reintenta con la siguiente lectura
+        if state["armed"]:
+            if fire:
+                return v
+        elif rearm:
+            state["armed"] = True
+        return None
+
+    def disarm() -> None:
+        state["armed"] = False
+
+    return check, disarm
+
+
+def _rate_check(spec: Dict[str, Any], window: _Window) -> Callable[[float, float], Optional[float]]:
+    compare = _OPS[_op(spec)]
+    limit = float(spec["value"])
+
+    def check(t: float, v: float) -> Optional[float]:
+        rate = window.rate()
+        if rate is not None and compare(rate, limit):
+            return rate
+        return None
+
+    return check
+
+
+def _window_check(spec: Dict[str, Any], window: _Window) -> Callable[[float, float], Optional[float]]:
+    compare = _OPS[_op(spec)]
+    limit = float(spec["value"])
+    agg = spec.get("agg", "avg")
+    if agg not in _AGGREGATES:
+        raise ValueError(f"Rule {spec['name']!r} has unknown agg: {agg}")
+
+    def check(t: float, v: float) -> Optional[float]:
+        if not window.full(t):
+            return None
+        observed = window.aggregate(agg)
+        if compare(observed, limit):
+            return observed
+        return None
+
+    return check
+
+
+def compile_rules(rules: Iterable[Dict[str, Any]]) -> Dict[str, _SensorProgram]:
+    """
+    Compilar reglas declarativas
+
+    Args:
+        rules: Reglas como diccionarios
+
+    Returns:
+        Programa compilado por sensor
+    """
+    programs: Dict[str, _SensorProgram] = {}
+    thresholds: Dict[Tuple[str, str], List[Tuple[float, _CompiledRule]]] = {}
+    windows: Dict[Tuple[str, float], _Window] = {}
+    names = set()
+
+    for spec in rules:
+        _require(spec, "name", "sensor", "type")
+        if spec["name"] in names:
+            raise ValueError(f"Duplicate rule name: {spec['name']!r}")
+        names.add(spec["name"])
+
+        sensor = spec["sensor"]
+        kind = spec["type"]
+        program = programs.setdefault(sensor, _SensorProgram())
+
+        if kind == "threshold":
+            _require(spec, "value")
+            op = _op(spec)
+            value = float(spec["value"])
+            thresholds.setdefault((sensor, op), []).append((value, _CompiledRule(spec, value)))
+        elif kind == "hysteresis":
+            _require(spec, "high", "low")
+            rule = _CompiledRule(spec, float(spec["low" if spec.get("direction") == "below" else "high"]))
+            check, rule.on_delivered = _hysteresis_check(spec)
+            program.checks.append((rule, check))
+        elif kind in ("rate", "window"):
+            _require(spec, "value", "window")
+            span = float(spec["window"])
+            if span <= 0:
+                raise ValueError(f"Rule {spec['name']!r} needs a positive window")
+            window = windows.get((sensor, span))
+            if window is None:
+                window = windows[(sensor, span)] = _Window(span)
+                program.windows.append(window)
+            check = _rate_check(spec, window) if kind == "rate" else _window_check(spec, window)
+            program.checks.append((_CompiledRule(spec, float(spec["value"])), check))
+        else:
+            raise ValueError(f"Rule {spec['name']!r} has unknown type: {kind}")
+
+    for (sensor, op), entries in thresholds.items():
+        programs[sensor].thresholds.append(_ThresholdGroup(op, entries))
+
+    return programs
+
+
+class RuleEngine:
+    """Evalúa reglas compiladas sobre lecturas y dispara alertas x402"""
+
+    def __init__(
+        self,
+        rules: Iterable[Dict[str, Any]],
+        agent: Optional[Any] = None,
+        alert_url: Optional[str] = None,
+        amount: str = "0.0001",
+        tier: str = "basic",
+        scheduler: Optional[Any] = None
+    ):
+        """
+        Inicializar motor de reglas
+
+        Args:
+            rules: Reglas declarativas (ver docstring del módulo)
+            agent: Cliente AgentHub para enviar alertas (opcional)
+            alert_url: Endpoint de alertas (por defecto agent.ALERTS_API)
+            amount: Cantidad a pagar por alerta (en USDC)
+            tier: Tier de pago
+            scheduler: UplinkScheduler por el que encolar las alertas (opcional)
+        """
+        self.rules = list(rules)
+        self.programs = compile_rules(self.rules)
+        # Programas por (sensor, fuente), compilados al ver cada fuente
+        self._source_programs: Dict[Tuple[str, str], _SensorProgram] = {}
+        self.agent = agent
+        self.scheduler = scheduler
+        if alert_url is None and agent is not None:
+            alert_url = agent.ALERTS_API
+        self.alert_url = alert_url
+        self.amount = amount
+        self.tier = tier
+
+    def evaluate(
+        self,
+        sensor: str,
+        value: float,
+        timestamp: Optional[float] = None,
+        source: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Evaluar una lectura y enviar las alertas que dispare
+
+        Args:
+            sensor: Nombre del sensor
+            value: Valor leído
+            timestamp: Segundos desde epoch (por defecto time.time())
+            source: Fuente de la lectura; cada fuente tiene su propio estado
+
+        Returns:
+            Lista de alertas generadas: payload enviado con x402_request más
+            "result" (respuesta de x402_request, o Future si se encoló en el
+            scheduler; None si no hay a quién enviarla)
+        """
+        program = self._program(sensor, source)
+        if program is None:
+            return []
+        t = time.time() if timestamp is None else timestamp
+
+        for window in program.windows:
+            window.push(t, value)
+
+        alerts = []
+        for group in program.thresholds:
+            for rule in group.matches(value):
+                if rule.ready(t):
+                    alerts.append(self._fire(rule, t, value, value, source))
+        for rule, check in program.checks:
+            # Las comprobaciones no consumen estado al disparar (ver
+            # _hysteresis_check), así que se evalúan aunque la regla no esté
+            # lista para que la histéresis pueda rearmarse
+            observed = check(t, value)
+            if observed is not None and rule.ready(t):
+                alerts.append(self._fire(rule, t, value, observed, source))
+        return alerts
+
+    def evaluate_many(
+        self,
+        readings: Iterable[Tuple[str, float, Optional[float]]]
+    ) -> List[Dict[str, Any]]:
+        """Evaluar una secuencia de lecturas (sensor, valor, timestamp)"""
+        alerts = []
+        for sensor, value, timestamp in readings:
+            alerts.extend(self.evaluate(sensor, value, timestamp))
+        return alerts
+
+    def _program(self, sensor: str, source: Optional[str]) -> Optional[_SensorProgram]:
+        if source is None or sensor not in self.programs:
+            return self.programs.get(sensor)
+        program = self._source_programs.get((sensor, source))
+        if program is None:
+            specs = [spec for spec in self.rules if spec["sensor"] == sensor]
+            program = self._source_programs[(sensor, source)] = compile_rules(specs)[sensor]
+        return program
+
+    def _fire(
+        self,
+        rule: _CompiledRule,
+        t: float,
+        value: float,
+        observed: float,
+        source: Optional[str] = None
+    ) -> Dict[str, Any]:
+        alert_data: Dict[str, Any] = {
+            "alert": rule.alert,
+            "rule": rule.name,
+            "sensor": rule.sensor,
+            rule.sensor: value,
+            "value": value,
+            "observed": observed,
+            "threshold": rule.threshold,
+            "timestamp": int(t * 1000),
+        }
+        if source is not None:
+            alert_data["source"] = source
+        if self.agent is not None:
+            alert_data["agentId"] = self.agent.get_agent_id()
+        if rule.data:
+            alert_data.update(rule.data)
+
+        url = rule.url or self.alert_url
+        if url is None or (self.scheduler is None and self.agent is None):
+            # Alerta solo local: no hay envío que confirmar
+            rule.delivered(t)
+            return dict(alert_data, result=None)
+
+        amount = rule.amount or self.amount
+        tier = rule.tier or self.tier
+        if self.scheduler is not None:
+            rule.sending = True
+            future = self.scheduler.x402_request(url, amount, alert_data, tier=tier)
+            future.add_done_callback(lambda f: self._sent(rule, t, f))
+            return dict(alert_data, result=future)
+
+        result = self.agent.x402_request(url, amount, alert_data, tier=tier)
+        if result.get("success"):
+            rule.delivered(t)
+        return dict(alert_data, result=result)
+
+    def _sent(self, rule: _CompiledRule, t: float, future: Any) -> None:
+        rule.sending = False
+        if future.cancelled() or future.exception() is not None:
+            return
+        if future.result().get("success"):
+            rule.delivered(t)
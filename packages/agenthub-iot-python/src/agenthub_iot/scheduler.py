@@ -0,0 +1,359 @@
+"""
+AgentHub IoT Uplink Scheduler
+Planificador de transmisión con clases de prioridad para enlaces limitados
+
+Todas las peticiones salen por un único hilo emisor (el enlace se modela como
+un canal serie). Las alertas siempre se envían antes que la telemetría y los
+lotes bulk; los lotes grandes se trocean para que una alerta pueda colarse
+entre dos trozos. Opcionalmente se aplica un presupuesto de ancho de banda
+(token bucket, bytes/s) del que las alertas pueden tomar prestado sin esperar.
+"""
+
+import heapq
+import itertools
+import json
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from typing import Any, Callable, Deque, Dict, List, Optional, Sequence
+
+from .compression import encode_series
+
+# Clases de prioridad, de mayor a menor
+PRIORITY_CLASSES = ("alert", "telemetry", "bulk")
+
+# Muestras de latencia conservadas por clase para percentiles
+_LATENCY_SAMPLES = 1024
+
+
+class _Job:
+    __slots__ = ("rank", "seq", "priority", "func", "size", "future", "enqueued_at")
+
+    def __init__(self, rank, seq, priority, func, size, future, enqueued_at):
+        self.rank = rank
+        self.seq = seq
+        self.priority = priority
+        self.func = func
+        self.size = size
+        self.future = future
+        self.enqueued_at = enqueued_at
+
+    def __lt__(self, other: "_Job") -> bool:
+        return (self.rank, self.seq) < (other.rank, other.seq)
+
+
+def _percentile(samples: Sequence[float], fraction: float) -> float:
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))
+    return ordered[index]
+
+
+class UplinkScheduler:
+    """Planificador de subida con prioridades para un cliente AgentHub"""
+
+    def __init__(
+        self,
+        agent: Any,
+        bandwidth: Optional[float] = None,
+        burst: Optional[int] = None,
+        chunk_points: int = 512
+    ):
+        """
+        Inicializar planificador
+
+        Args:
+            agent: Cliente AgentHub usado para enviar
+            bandwidth: Presupuesto en bytes/s (opcional, sin límite por defecto)
+            burst: Tamaño máximo del bucket en bytes (por defecto 1 s de bandwidth)
+            chunk_points: Puntos por trozo al subir series bulk
+        """
+        if bandwidth is not None and bandwidth <= 0:
+            raise ValueError("bandwidth must be positive")
+        if chunk_points <= 0:
+            raise ValueError("chunk_points must be positive")
+
+        self.agent = agent
+        self.bandwidth = bandwidth
+        self.burst = burst if burst is not None else (int(bandwidth) if bandwidth else 0)
+        self.chunk_points = chunk_points
+
+        self._heap: List[_Job] = []
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._running = False
+        self._stopped = False
+
+        self._tokens = float(self.burst)
+        self._refilled_at = time.monotonic()
+
+        self._latencies: Dict[str, Deque[float]] = {
+            name: deque(maxlen=_LATENCY_SAMPLES) for name in PRIORITY_CLASSES
+        }
+        self._stats: Dict[str, Dict[str, float]] = {
+            name: {"sent": 0, "bytes": 0, "latency_sum": 0.0, "latency_max": 0.0}
+            for name in PRIORITY_CLASSES
+        }
+
+    # Ciclo de vida
+
+    def start(self) -> "UplinkScheduler":
+        """Arrancar el hilo emisor"""
+        with self._cond:
+            if self._running:
+                return self
+            self._running = True
+            self._stopped = False
+            self._thread = threading.Thread(
+                target=self._run, name="agenthub-uplink", daemon=True
+            )
+            self._thread.start()
+        return self
+
+    def stop(self, drain: bool = True, timeout: Optional[float] = None) -> None:
+        """
+        Detener el hilo emisor
+
+        Args:
+            drain: Enviar lo pendiente antes de parar; si es False se cancela
+            timeout: Tiempo máximo de espera del hilo
+        """
+        with self._cond:
+            # Sin hilo emisor no hay quien vacíe la cola
+            if not drain or self._thread is None:
+                while self._heap:
+                    heapq.heappop(self._heap).future.cancel()
+            self._running = False
+            self._stopped = True
+            self._cond.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def __enter__(self) -> "UplinkScheduler":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    # Encolado
+
+    def submit(
+        self,
+        func: Callable[[], Any],
+        size: int = 0,
+        priority: str = "telemetry"
+    ) -> Future:
+        """
+        Encolar una transmisión arbitraria
+
+        Lo encolado antes de start() se envía al arrancar.
+
+        Args:
+            func: Función que realiza el envío
+            size: Bytes aproximados que consume del presupuesto
+            priority: Clase de prioridad ("alert", "telemetry" o "bulk")
+
+        Returns:
+            Future con el resultado de func
+
+        Raises:
+            RuntimeError: Si el planificador ya se detuvo
+        """
+        if priority not in PRIORITY_CLASSES:
+            raise ValueError(f"Unknown priority class: {priority}")
+        future: Future = Future()
+        job = _Job(
+            PRIORITY_CLASSES.index(priority), next(self._seq), priority,
+            func, size, future, time.monotonic()
+        )
+        with self._cond:
+            if self._stopped:
+                raise RuntimeError("UplinkScheduler is stopped")
+            heapq.heappush(self._heap, job)
+            self._cond.notify_all()
+        return future
+
+    def x402_request(
+        self,
+        url: str,
+        amount: str,
+        data: Optional[Dict[str, Any]] = None,
+        token: str = "USDC",
+        tier: str = "basic",
+        priority: str = "alert"
+    ) -> Future:
+        """Encolar AgentHub.x402_request (por defecto como alerta)"""
+        size = len(json.dumps(data)) if data else 2
+        return self.submit(
+            lambda: self.agent.x402_request(url, amount, data, token=token, tier=tier),
+            size=size,
+            priority=priority
+        )
+
+    def send_sensor_data(
+        self,
+        endpoint: str,
+        data: Dict[str, Any],
+        priority: str = "telemetry"
+    ) -> Future:
+        """Encolar AgentHub.send_sensor_data"""
+        return self.submit(
+            lambda: self.agent.send_sensor_data(endpoint, data),
+            size=len(json.dumps(data)),
+            priority=priority
+        )
+
+    def send_sensor_series(
+        self,
+        endpoint: str,
+        timestamps: Sequence[int],
+        values: Sequence[float],
+        sensor: Optional[str] = None,
+        priority: str = "bulk"
+    ) -> Future:
+        """
+        Encolar un lote comprimido, troceado en chunk_points puntos
+
+        El endpoint debe decodificar cada trozo con decode_series.
+
+        Returns:
+            Future con la lista de respuestas de cada trozo
+        """
+        if len(timestamps) != len(values):
+            raise ValueError("timestamps and values must have the same length")
+
+        chunks: List[Future] = []
+        for start in range(0, len(timestamps), self.chunk_points):
+            chunk_ts = timestamps[start:start + self.chunk_points]
+            # Codificar una sola vez: el tamaño y el envío usan el mismo payload
+            payload = encode_series(chunk_ts, values[start:start + self.chunk_points])
+            chunks.append(self.submit(
+                lambda p=payload, n=len(chunk_ts): self.agent.send_series_payload(
+                    endpoint, p, n, sensor=sensor
+                ),
+                size=len(payload),
+                priority=priority
+            ))
+        return _gather(chunks)
+
+    # Métricas
+
+    def pending(self) -> Dict[str, int]:
+        """Número de transmisiones en cola por clase"""
+        counts = {name: 0 for name in PRIORITY_CLASSES}
+        with self._cond:
+            for job in self._heap:
+                counts[job.priority] += 1
+        return counts
+
+    def metrics(self) -> Dict[str, Dict[str, float]]:
+        """
+        Latencia en cola por clase de prioridad (segundos)
+
+        Returns:
+            Dict por clase con sent, bytes, pending, latency_avg, latency_max,
+            latency_p50 y latency_p95
+        """
+        pending = self.pending()
+        result = {}
+        with self._cond:
+            for name in PRIORITY_CLASSES:
+                stats = self._stats[name]
+                samples = list(self._latencies[name])
+                sent = stats["sent"]
+                result[name] = {
+                    "sent": sent,
+                    "bytes": stats["bytes"],
+                    "pending": pending[name],
+                    "latency_avg": stats["latency_sum"] / sent if sent else 0.0,
+                    "latency_max": stats["latency_max"],
+                    "latency_p50": _percentile(samples, 0.50) if samples else 0.0,
+                    "latency_p95": _percentile(samples, 0.95) if samples else 0.0,
+                }
+        return result
+
+    # Hilo emisor
+
+    def _refill(self, now: float) -> None:
+        if self.bandwidth is None:
+            return
+        self._tokens = min(
+            float(self.burst),
+            self._tokens + (now - self._refilled_at) * self.bandwidth
+        )
+        self._refilled_at = now
+
+    def _next_job(self) -> Optional[_Job]:
+        """Esperar al siguiente trabajo que el presupuesto permite enviar"""
+        with self._cond:
+            while True:
+                if not self._heap:
+                    if not self._running:
+                        return None
+                    self._cond.wait()
+                    continue
+
+                job = self._heap[0]
+                now = time.monotonic()
+                self._refill(now)
+
+                if self.bandwidth is not None and job.priority != "alert":
+                    # Un trabajo mayor que el bucket sale con el bucket lleno
+                    needed = min(job.size, self.burst)
+                    if self._tokens < needed:
+                        # Esperar; una alerta nueva despierta y pasa delante
+                        self._cond.wait((needed - self._tokens) / self.bandwidth)
+                        continue
+
+                heapq.heappop(self._heap)
+                if self.bandwidth is not None:
+                    # Las alertas pueden dejar el bucket en negativo
+                    self._tokens -= job.size
+
+                latency = now - job.enqueued_at
+                stats = self._stats[job.priority]
+                stats["sent"] += 1
+                stats["bytes"] += job.size
+                stats["latency_sum"] += latency
+                stats["latency_max"] = max(stats["latency_max"], latency)
+                self._latencies[job.priority].append(latency)
+                return job
+
+    def _run(self) -> None:
+        while True:
+            job = self._next_job()
+            if job is None:
+                return
+            if not job.future.set_running_or_notify_cancel():
+                continue
+            try:
+                job.future.set_result(job.func())
+            except Exception as e:
+                job.future.set_exception(e)
+
+
+def _gather(futures: List[Future]) -> Future:
+    """Future que se resuelve con los resultados de todos los futures"""
+    combined: Future = Future()
+    if not futures:
+        combined.set_result([])
+        return combined
+
+    remaining = [len(futures)]
+    lock = threading.Lock()
+
+    def _done(_: Future) -> None:
+        with lock:
+            remaining[0] -= 1
+            if remaining[0]:
+                return
+        try:
+            combined.set_result([f.result() for f in futures])
+        except BaseException as e:
+            combined.set_exception(e)
+
+    for future in futures:
+        future.add_done_callback(_done)
+    return combined
@@ -0,0 +1,413 @@
+"""
+AgentHub IoT Sensor Drivers
+Lectura concurrente de sensores sysfs, 1-Wire (DS18B20) e IIO
+
+Una conversión de un DS18B20 tarda ~750 ms y el kernel bloquea la lectura de
+w1_slave mientras dura, así que leer 20 sondas una tras otra cuesta 15 s.
+SensorBus dispara la conversión de todas las sondas de cada bus a la vez
+(therm_bulk_read del driver w1_therm) y lee todas las fuentes en paralelo con
+un pool de hilos: el tiempo total pasa a ser el de una conversión.
+
+Cada atributo sysfs se abre una vez y se relee con pread sobre un buffer
+preasignado; el valor se parsea directamente de los bytes, sin decodificar
+ni partir líneas. Las lecturas tienen la forma de payload de
+send_sensor_data, de modo que pueden subirse tal cual.
+
+Todas las rutas cuelgan de root, por lo que los drivers funcionan igual
+contra un árbol sysfs falso en tests.
+"""
+
+import asyncio
+import glob
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+W1_DEVICES = "sys/bus/w1/devices"
+IIO_DEVICES = "sys/bus/iio/devices"
+
+# Familias 1-Wire de termómetros soportadas por w1_therm
+W1_THERM_FAMILIES = ("10", "22", "28", "3b", "42")
+
+# Canales IIO: (tipo de sensor, unidad, factor desde la unidad del ABI IIO)
+IIO_CHANNELS = {
+    "temp": ("temperature", "C", 0.001),
+    "humidityrelative": ("humidity", "%", 0.001),
+    "pressure": ("pressure", "kPa", 1.0),
+    "illuminance": ("illuminance", "lux", 1.0),
+}
+
+# Sondeo de therm_bulk_read mientras dura la conversión
+_BULK_POLL_INTERVAL = 0.05
+
+
+class SensorError(Exception):
+    """Lectura de sensor fallida o inválida"""
+
+
+class _Attribute:
+    """Atributo sysfs abierto una vez y releído con pread"""
+
+    def __init__(self, path: str, size: int = 128):
+        self.path = path
+        self.buffer = bytearray(size)
+        self._fd: Optional[int] = None
+
+    def read(self) -> int:
+        """Releer el atributo en buffer; devuelve los bytes leídos"""
+        if self._fd is None:
+            self._fd = os.open(self.path, os.O_RDONLY)
+        try:
+            # pread en offset 0 vuelve a invocar show() en sysfs
+            return os.preadv(self._fd, [self.buffer], 0)
+        except OSError:
+            # El dispositivo pudo desaparecer y volver: reabrir en la siguiente
+            self.close()
+            raise
+
+    def close(self) -> None:
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+
+
+def _read_number(path: str) -> float:
+    with open(path, "rb") as f:
+        return float(f.read())
+
+
+class Sensor:
+    """Sensor sysfs de un único valor numérico"""
+
+    def __init__(
+        self,
+        path: str,
+        sensor_id: str,
+        sensor_type: str,
+        unit: str,
+        scale: float = 1.0,
+        offset: float = 0.0
+    ):
+        """
+        Inicializar sensor
+
+        Args:
+            path: Atributo sysfs con el valor (p. ej. hwmon temp1_input)
+            sensor_id: Identificador del sensor en los payloads
+            sensor_type: Tipo de sensor ("temperature", "humidity"...)
+            unit: Unidad del valor devuelto
+            scale: Factor aplicado al valor leído
+            offset: Desplazamiento sumado antes de escalar
+        """
+        self.sensor_id = sensor_id
+        self.sensor_type = sensor_type
+        self.unit = unit
+        self.scale = scale
+        self.offset = offset
+        # Los atributos procesados (_input, hwmon) pueden tener decimales;
+        # los _raw de IIO son enteros
+        self._parse = float
+        self._attribute = _Attribute(path)
+
+    @property
+    def path(self) -> str:
+        return self._attribute.path
+
+    def read(self) -> float:
+        """Leer el valor actual"""
+        n = self._attribute.read()
+        try:
+            raw = self._parse(self._attribute.buffer[:n])
+        except ValueError:
+            raise SensorError(f"{self.sensor_id}: invalid value") from None
+        return (raw + self.offset) * self.scale
+
+    def close(self) -> None:
+        self._attribute.close()
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.sensor_id!r})"
+
+
+class W1Therm(Sensor):
+    """Termómetro 1-Wire (DS18B20 y compatibles) vía w1_slave"""
+
+    def __init__(self, device_dir: str):
+        """
+        Inicializar termómetro
+
+        Args:
+            device_dir: Directorio del dispositivo (p. ej. /sys/bus/w1/devices/28-0316a2796eff)
+        """
+        super().__init__(
+            os.path.join(device_dir, "w1_slave"),
+            sensor_id=os.path.basename(os.path.normpath(device_dir)),
+            sensor_type="temperature",
+            unit="C",
+            scale=0.001
+        )
+        # El directorio enlaza al del bus master, que expone therm_bulk_read
+        bulk = os.path.join(os.path.dirname(os.path.realpath(device_dir)), "therm_bulk_read")
+        self.bulk_read_path = bulk if os.path.exists(bulk) else None
+
+    def read(self) -> float:
+        """
+        Leer la temperatura
+
+        w1_slave contiene dos líneas: el scratchpad con "crc=xx YES|NO" y de
+        nuevo el scratchpad con "t=<milicelsius>".
+        """
+        n = self._attribute.read()
+        buffer = self._attribute.buffer
+        if buffer.find(b"YES", 0, n) < 0:
+            raise SensorError(f"{self.sensor_id}: CRC check failed")
+        start = buffer.find(b"t=", 0, n)
+        if start < 0:
+            raise SensorError(f"{self.sensor_id}: no temperature in w1_slave")
+        try:
+            return int(buffer[start + 2:n]) * self.scale
+        except ValueError:
+            raise SensorError(f"{self.sensor_id}: invalid temperature") from None
+
+
+class IioChannel(Sensor):
+    """Canal de un dispositivo IIO (in_<canal>_input o in_<canal>_raw)"""
+
+    def __init__(self, device_dir: str, channel: str):
+        """
+        Inicializar canal
+
+        Args:
+            device_dir: Directorio del dispositivo (p. ej. /sys/bus/iio/devices/iio:device0)
+            channel: Canal IIO ("temp", "humidityrelative", "pressure"...)
+        """
+        if channel not in IIO_CHANNELS:
+            raise ValueError(f"Unsupported IIO channel: {channel}")
+        sensor_type, unit, factor = IIO_CHANNELS[channel]
+
+        name = os.path.basename(os.path.normpath(device_dir))
+        name_path = os.path.join(device_dir, "name")
+        if os.path.exists(name_path):
+            with open(name_path, "rb") as f:
+                name = f"{f.read().decode('utf-8').strip()}-{name}"
+
+        prefix = os.path.join(device_dir, f"in_{channel}")
+        offset, scale = 0.0, factor
+        if os.path.exists(prefix + "_input"):
+            path = prefix + "_input"
+        else:
+            # Valor procesado = (raw + offset) * scale, en la unidad del ABI
+            path = prefix + "_raw"
+            if os.path.exists(prefix + "_offset"):
+                offset = _read_number(prefix + "_offset")
+            if os.path.exists(prefix + "_scale"):
+                scale = _read_number(prefix + "_scale") * factor
+
+        super().__init__(path, f"{name}:{channel}", sensor_type, unit, scale=scale, offset=offset)
+        if path.endswith("_raw"):
+            self._parse = int
+
+
+def discover(root: str = "/") -> List[Sensor]:
+    """
+    Descubrir termómetros 1-Wire y canales IIO
+
+    Args:
+        root: Raíz del sistema de ficheros (un árbol sysfs falso en tests)
+
+    Returns:
+        Sensores encontrados, ordenados por identificador
+    """
+    sensors: List[Sensor] = []
+    for device_dir in sorted(glob.glob(os.path.join(root, W1_DEVICES, "*-*"))):
+        family = os.path.basename(device_dir).split("-", 1)[0].lower()
+        if family in W1_THERM_FAMILIES and os.path.exists(os.path.join(device_dir, "w1_slave")):
+            sensors.append(W1Therm(device_dir))
+
+    for device_dir in sorted(glob.glob(os.path.join(root, IIO_DEVICES, "iio:device*"))):
+        for channel in IIO_CHANNELS:
+            prefix = os.path.join(device_dir, f"in_{channel}")
+            if os.path.exists(prefix + "_input") or os.path.exists(prefix + "_raw"):
+                sensors.append(IioChannel(device_dir, channel))
+    return sensors
+
+
+class SensorBus:
+    """Lee un conjunto de sensores en paralelo"""
+
+    def __init__(
+        self,
+        sensors: Optional[Sequence[Sensor]] = None,
+        root: str = "/",
+        max_workers: Optional[int] = None,
+        bulk_convert: bool = True,
+        conversion_timeout: float = 1.5
+    ):
+        """
+        Inicializar bus de sensores
+
+        Args:
+            sensors: Sensores a leer (por defecto discover(root))
+            root: Raíz del sistema de ficheros para el descubrimiento
+            max_workers: Lecturas concurrentes (por defecto una por sensor, hasta 32)
+            bulk_convert: Disparar las conversiones 1-Wire de cada bus a la vez
+            conversion_timeout: Espera máxima de una conversión en bloque (s)
+        """
+        self.sensors = list(sensors) if sensors is not None else discover(root)
+        self.max_workers = max_workers or max(1, min(32, len(self.sensors)))
+        self.bulk_convert = bulk_convert
+        self.conversion_timeout = conversion_timeout
+
+        # Último error por sensor (solo lecturas fallidas de la última pasada)
+        self.errors: Dict[str, str] = {}
+        self._lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    def close(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+        for sensor in self.sensors:
+            sensor.close()
+
+    def __enter__(self) -> "SensorBus":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    # Lectura
+
+    def read_all(self) -> List[Dict[str, Any]]:
+        """
+        Leer todos los sensores en paralelo
+
+        Returns:
+            Lecturas {"sensorId", "sensorType", "value", "unit", "timestamp"}
+            de los sensores que respondieron; los fallos quedan en errors
+        """
+        if not self.sensors:
+            return []
+        if self.bulk_convert:
+            self.convert()
+
+        results = list(self._get_executor().map(self._read_one, self.sensors))
+        readings = []
+        errors = {}
+        for sensor, result in zip(self.sensors, results):
+            if isinstance(result, Exception):
+                errors[sensor.sensor_id] = str(result)
+            else:
+                readings.append(result)
+        self.errors = errors
+        return readings
+
+    async def read_async(self) -> List[Dict[str, Any]]:
+        """read_all sin bloquear el bucle asyncio"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self.read_all)
+
+    def convert(self) -> int:
+        """
+        Disparar la conversión de todos los termómetros de cada bus 1-Wire y
+        esperar a que termine
+
+        Returns:
+            Número de buses disparados
+        """
+        buses = {
+            sensor.bulk_read_path for sensor in self.sensors
+            if isinstance(sensor, W1Therm) and sensor.bulk_read_path is not None
+        }
+        triggered = []
+        for path in buses:
+            try:
+                fd = os.open(path, os.O_WRONLY)
+                try:
+                    os.write(fd, b"trigger\n")
+                finally:
+                    os.close(fd)
+                triggered.append(path)
+            except OSError:
+                # Sin soporte de bulk: cada lectura hará su propia conversión
+                continue
+
+        # therm_bulk_read devuelve -1 mientras alguna conversión sigue en curso
+        pending = list(triggered)
+        deadline = time.monotonic() + self.conversion_timeout
+        while pending and time.monotonic() < deadline:
+            pending = [path for path in pending if self._converting(path)]
+            if pending:
+                time.sleep(_BULK_POLL_INTERVAL)
+        return len(triggered)
+
+    def _converting(self, path: str) -> bool:
+        try:
+            with open(path, "rb") as f:
+                return f.read(2) == b"-1"
+        except OSError:
+            return False
+
+    def _read_one(self, sensor: Sensor) -> Any:
+        try:
+            value = sensor.read()
+        except (OSError, SensorError) as e:
+            return e
+        return {
+            "sensorId": sensor.sensor_id,
+            "sensorType": sensor.sensor_type,
+            "value": value,
+            "unit": sensor.unit,
+            "timestamp": int(time.time() * 1000),
+        }
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers,
+                    thread_name_prefix="agenthub-sensors"
+                )
+            return self._executor
+
+    # Subida
+
+    def send(
+        self,
+        target: Any,
+        endpoint: str,
+        readings: Optional[List[Dict[str, Any]]] = None
+    ) -> Any:
+        """
+        Subir lecturas en un único envío
+
+        Args:
+            target: AgentHub o UplinkScheduler (cualquier objeto con send_sensor_data)
+            endpoint: URL del endpoint de sensores
+            readings: Lecturas a subir (por defecto read_all())
+
+        Returns:
+            Resultado de target.send_sensor_data
+        """
+        if readings is None:
+            readings = self.read_all()
+        return target.send_sensor_data(endpoint, {"readings": readings})
+
+    def evaluate(self, engine: Any, readings: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Evaluar lecturas con un RuleEngine
+
+        Las reglas pueden referirse a un sensor concreto (sensorId) o a todos
+        los de un tipo (sensorType); estas últimas se evalúan por separado
+        para cada sensor, sin mezclar ventanas ni estado entre sondas.
+        """
+        alerts: List[Dict[str, Any]] = []
+        for reading in readings:
+            sensor_id = reading["sensorId"]
+            value = reading["value"]
+            timestamp = reading["timestamp"] / 1000
+            alerts.extend(engine.evaluate(sensor_id, value, timestamp))
+            alerts.extend(engine.evaluate(reading["sensorType"], value, timestamp, source=sensor_id))
+        return alerts
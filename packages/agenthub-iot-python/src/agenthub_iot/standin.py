@@ -0,0 +1,356 @@
+"""
+AgentHub IoT Stand-in Servers
+Servidores locales que imitan la API de AgentHub para pruebas y benchmarks
+
+Responden a las rutas que usa el SDK con respuestas JSON similares a las
+de la app Next.js:
+
+    POST /api/iot/sensors
+    POST /api/iot/alerts
+    POST /api/x402/pay
+
+StandinServer sirve HTTP/1.1 (http.server). H2StandinServer sirve HTTP/2 en
+claro con prior knowledge (h2c) y requiere el paquete h2 (extra "http2").
+Ambos cuentan peticiones por ruta y conexiones aceptadas, y pueden añadir
+una latencia artificial y una tasa de errores 503 por petición.
+"""
+
+import asyncio
+import hashlib
+import json
+import random
+import socket
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Mapping, Optional, Set, Tuple
+
+try:
+    import h2.config
+    import h2.connection
+    import h2.events
+    import h2.exceptions
+except ImportError:  # pragma: no cover - depende del entorno
+    h2 = None  # type: ignore[assignment]
+
+SENSORS_PATH = "/api/iot/sensors"
+ALERTS_PATH = "/api/iot/alerts"
+X402_PATH = "/api/x402/pay"
+
+
+class _Stats:
+    """Contadores compartidos por ambos servidores"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.requests: Dict[str, int] = {}
+        self.connections = 0
+        self.bytes_received = 0
+
+    def connection(self) -> None:
+        with self._lock:
+            self.connections += 1
+
+    def request(self, path: str, size: int) -> None:
+        with self._lock:
+            self.requests[path] = self.requests.get(path, 0) + 1
+            self.bytes_received += size
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "requests": dict(self.requests),
+                "connections": self.connections,
+                "bytes_received": self.bytes_received,
+            }
+
+
+def handle_request(path: str, headers: Mapping[str, str], body: bytes) -> Tuple[int, Dict[str, Any]]:
+    """
+    Respuesta simulada para una petición POST
+
+    Args:
+        path: Ruta de la petición (sin query string)
+        headers: Headers con nombres en minúsculas
+        body: Cuerpo de la petición
+
+    Returns:
+        Tupla (status, cuerpo JSON)
+    """
+    now = int(time.time() * 1000)
+    if path == SENSORS_PATH:
+        return 200, {
+            "success": True,
+            "message": "Sensor data received",
+            "agentId": headers.get("x-agent-id"),
+            "bytes": len(body),
+            "timestamp": now,
+        }
+    if path == ALERTS_PATH:
+        return 200, {
+            "success": True,
+            "message": "Alert received and processed",
+            "paymentVerified": "x-payment" in headers,
+            "timestamp": now,
+        }
+    if path == X402_PATH:
+        payment = headers.get("x-payment", "")
+        return 200, {
+            "success": True,
+            "txHash": "0x" + hashlib.sha256(payment.encode("utf-8") + body).hexdigest(),
+            "chain": "avalanche-fuji",
+        }
+    return 404, {"error": "Not found"}
+
+
+def _respond_to(
+    error_rate: float,
+    path: str,
+    headers: Mapping[str, str],
+    body: bytes
+) -> Tuple[int, Dict[str, Any]]:
+    if error_rate and random.random() < error_rate:
+        return 503, {"error": "Service unavailable"}
+    return handle_request(path, headers, body)
+
+
+class StandinServer:
+    """Stand-in HTTP/1.1 de la API de AgentHub"""
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        latency: float = 0.0,
+        error_rate: float = 0.0
+    ):
+        """
+        Inicializar servidor
+
+        Args:
+            host: Dirección de escucha
+            port: Puerto (0 = cualquiera libre)
+            latency: Segundos de espera añadidos a cada respuesta
+            error_rate: Fracción de peticiones respondidas con 503
+        """
+        self.latency = latency
+        self.error_rate = error_rate
+        self.stats = _Stats()
+        self._thread: Optional[threading.Thread] = None
+
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def setup(self):
+                super().setup()
+                # Headers y cuerpo salen en escrituras separadas; sin Nagle
+                self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+                server.stats.connection()
+
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+                path = self.path.split("?", 1)[0]
+                server.stats.request(path, len(body))
+                headers = {k.lower(): v for k, v in self.headers.items()}
+                status, payload = _respond_to(server.error_rate, path, headers, body)
+                if server.latency:
+                    time.sleep(server.latency)
+                data = json.dumps(payload).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, format, *args):
+                pass
+
+        self._httpd = ThreadingHTTPServer((host, port), Handler)
+        self._httpd.daemon_threads = True
+
+    @property
+    def url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "StandinServer":
+        self._thread = threading.Thread(
+            target=self._httpd.serve_forever, name="agenthub-standin", daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def __enter__(self) -> "StandinServer":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+
+class _H2Protocol(asyncio.Protocol):
+    """Conexión h2c del lado servidor"""
+
+    def __init__(self, server: "H2StandinServer"):
+        self.server = server
+        self.conn = h2.connection.H2Connection(
+            config=h2.config.H2Configuration(client_side=False, header_encoding="utf-8")
+        )
+        self.transport: Optional[asyncio.Transport] = None
+        self.streams: Dict[int, Tuple[Dict[str, str], bytearray]] = {}
+
+    def connection_made(self, transport) -> None:
+        self.transport = transport
+        self.server._protocols.add(self)
+        self.server.stats.connection()
+        self.conn.initiate_connection()
+        transport.write(self.conn.data_to_send())
+
+    def data_received(self, data: bytes) -> None:
+        try:
+            events = self.conn.receive_data(data)
+        except h2.exceptions.ProtocolError:
+            self._flush()
+            self.transport.close()
+            return
+
+        for event in events:
+            if isinstance(event, h2.events.RequestReceived):
+                self.streams[event.stream_id] = (dict(event.headers), bytearray())
+            elif isinstance(event, h2.events.DataReceived):
+                stream = self.streams.get(event.stream_id)
+                if stream is not None:
+                    stream[1].extend(event.data)
+                self.conn.acknowledge_received_data(event.flow_controlled_length, event.stream_id)
+            elif isinstance(event, h2.events.StreamEnded):
+                self._schedule_response(event.stream_id)
+            elif isinstance(event, h2.events.StreamReset):
+                self.streams.pop(event.stream_id, None)
+            elif isinstance(event, h2.events.ConnectionTerminated):
+                self.transport.close()
+        self._flush()
+
+    def _schedule_response(self, stream_id: int) -> None:
+        if self.server.latency:
+            asyncio.get_running_loop().call_later(self.server.latency, self._respond, stream_id)
+        else:
+            self._respond(stream_id)
+
+    def _respond(self, stream_id: int) -> None:
+        stream = self.streams.pop(stream_id, None)
+        if stream is None or self.transport is None or self.transport.is_closing():
+            return
+        headers, body = stream
+        path = headers.get(":path", "/").split("?", 1)[0]
+        self.server.stats.request(path, len(body))
+        if headers.get(":method") != "POST":
+            status, payload = 405, {"error": "Method not allowed"}
+        else:
+            status, payload = _respond_to(self.server.error_rate, path, headers, bytes(body))
+        data = json.dumps(payload).encode("utf-8")
+        try:
+            self.conn.send_headers(stream_id, [
+                (":status", str(status)),
+                ("content-type", "application/json"),
+                ("content-length", str(len(data))),
+            ])
+            self.conn.send_data(stream_id, data, end_stream=True)
+        except h2.exceptions.StreamClosedError:
+            return
+        self._flush()
+
+    def _flush(self) -> None:
+        pending = self.conn.data_to_send()
+        if pending and self.transport is not None:
+            self.transport.write(pending)
+
+    def connection_lost(self, exc) -> None:
+        self.server._protocols.discard(self)
+        self.transport = None
+        self.streams.clear()
+
+
+class H2StandinServer:
+    """Stand-in HTTP/2 (h2c, prior knowledge) de la API de AgentHub"""
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        latency: float = 0.0,
+        error_rate: float = 0.0
+    ):
+        """Mismos argumentos que StandinServer"""
+        if h2 is None:
+            raise ImportError("H2StandinServer requires h2: pip install agenthub-iot[http2]")
+        self.host = host
+        self.port = port
+        self.latency = latency
+        self.error_rate = error_rate
+        self.stats = _Stats()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._thread: Optional[threading.Thread] = None
+        self._protocols: Set[_H2Protocol] = set()
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    def start(self) -> "H2StandinServer":
+        ready = threading.Event()
+        errors = []
+
+        def run() -> None:
+            loop = asyncio.new_event_loop()
+            self._loop = loop
+            try:
+                self._server = loop.run_until_complete(loop.create_server(
+                    lambda: _H2Protocol(self), self.host, self.port
+                ))
+                self.port = self._server.sockets[0].getsockname()[1]
+            except Exception as e:
+                errors.append(e)
+                ready.set()
+                loop.close()
+                return
+            ready.set()
+            try:
+                loop.run_forever()
+            finally:
+                self._server.close()
+                for protocol in list(self._protocols):
+                    if protocol.transport is not None:
+                        protocol.transport.close()
+                # Procesar los cierres pendientes antes de cerrar el loop
+                loop.run_until_complete(asyncio.sleep(0))
+                loop.close()
+
+        self._thread = threading.Thread(target=run, name="agenthub-h2-standin", daemon=True)
+        self._thread.start()
+        ready.wait()
+        if errors:
+            raise errors[0]
+        return self
+
+    def stop(self) -> None:
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(self._loop.stop)
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self._loop = None
+
+    def __enter__(self) -> "H2StandinServer":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
@@ -0,0 +1,150 @@
+"""
+AgentHub IoT HTTP Transports
+Transportes HTTP compartibles entre varios clientes AgentHub
+
+Por defecto AgentHub usa requests.post (una conexión por petición). Un
+gateway con cientos de identidades puede pasar el mismo transporte a todos
+sus clientes:
+
+    RequestsTransport: pool de conexiones HTTP/1.1 (requests.Session)
+    Http2Transport: pocas conexiones HTTP/2 multiplexadas (httpx, opcional)
+    AsyncHttp2Transport: variante asyncio de Http2Transport
+
+Los transportes HTTP/2 requieren el extra "http2":
+
+    pip install agenthub-iot[http2]
+"""
+
+from typing import Any, Dict
+
+import requests
+from requests.adapters import HTTPAdapter
+
+try:
+    import httpx
+except ImportError:  # pragma: no cover - depende del entorno
+    httpx = None  # type: ignore[assignment]
+
+
+def _require_httpx() -> None:
+    if httpx is None:
+        raise ImportError(
+            "HTTP/2 transport requires httpx[http2]: pip install agenthub-iot[http2]"
+        )
+
+
+class RequestsTransport:
+    """Pool de conexiones HTTP/1.1 sobre requests.Session"""
+
+    def __init__(self, pool_connections: int = 10, pool_maxsize: int = 10):
+        """
+        Inicializar transporte
+
+        Args:
+            pool_connections: Hosts distintos mantenidos en el pool
+            pool_maxsize: Conexiones máximas por host
+        """
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def post(self, url: str, **kwargs: Any) -> Any:
+        """POST con la misma firma que requests.post"""
+        return self.session.post(url, **kwargs)
+
+    def close(self) -> None:
+        self.session.close()
+
+    def __enter__(self) -> "RequestsTransport":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def _httpx_kwargs(kwargs: Dict[str, Any]) -> Dict[str, Any]:
+    """Adaptar argumentos estilo requests a httpx"""
+    data = kwargs.pop("data", None)
+    if data is not None:
+        kwargs["content"] = data.encode("utf-8") if isinstance(data, str) else data
+    return kwargs
+
+
+class Http2Transport:
+    """Transporte HTTP/2 multiplexado (httpx)"""
+
+    def __init__(
+        self,
+        max_connections: int = 4,
+        http1: bool = True,
+        verify: Any = True
+    ):
+        """
+        Inicializar transporte
+
+        Args:
+            max_connections: Conexiones máximas; cada una multiplexa muchos streams
+            http1: Permitir HTTP/1.1 como alternativa (ALPN). Con False se usa
+                HTTP/2 con prior knowledge, necesario para servidores h2c en http://
+            verify: Verificación TLS (como en httpx)
+        """
+        _require_httpx()
+        self.client = httpx.Client(
+            http1=http1,
+            http2=True,
+            verify=verify,
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_connections
+            )
+        )
+
+    def post(self, url: str, **kwargs: Any) -> Any:
+        """POST con la misma firma que requests.post"""
+        return self.client.post(url, **_httpx_kwargs(kwargs))
+
+    def close(self) -> None:
+        self.client.close()
+
+    def __enter__(self) -> "Http2Transport":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+class AsyncHttp2Transport:
+    """Transporte HTTP/2 multiplexado para asyncio (httpx)"""
+
+    def __init__(
+        self,
+        max_connections: int = 4,
+        http1: bool = True,
+        verify: Any = True
+    ):
+        """Mismos argumentos que Http2Transport"""
+        _require_httpx()
+        self.client = httpx.AsyncClient(
+            http1=http1,
+            http2=True,
+            verify=verify,
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_connections
+            )
+        )
+
+    async def post(self, url: str, **kwargs: Any) -> Any:
+        """POST con la misma firma que requests.post"""
+        return await self.client.post(url, **_httpx_kwargs(kwargs))
+
+    async def aclose(self) -> None:
+        await self.client.aclose()
+
+    async def __aenter__(self) -> "AsyncHttp2Transport":
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        await self.aclose()
+
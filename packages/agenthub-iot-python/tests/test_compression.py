@@ -0,0 +1,141 @@
+"""
+Tests for AgentHub IoT series compression
+"""
+
+import math
+import os
+import random
+import sys
+from unittest.mock import Mock, patch
+
+import pytest
+
+# Add parent directory to path
+src_path = os.path.join(os.path.dirname(__file__), '..', 'src')
+if src_path not in sys.path:
+    sys.path.insert(0, src_path)
+
+from agenthub_iot import AgentHub, decode_series, encode_series  # type: ignore[reportMissingImports]
+from agenthub_iot.compression import CONTENT_TYPE, bytes_per_point  # type: ignore[reportMissingImports]
+
+TEST_AGENT_ID = "test-iot-agent-001"
+TEST_PRIVATE_KEY = "0x" + "1" * 64
+
+
+def temperature_trace(points, interval_ms=1000, seed=7):
+    """Traza de temperatura realista (resolución DS18B20 de 0.0625 °C)"""
+    rng = random.Random(seed)
+    start = 1_700_000_000_000
+    timestamps = []
+    values = []
+    for i in range(points):
+        jitter = rng.choice((0, 0, 0, 0, 1, -1))
+        timestamps.append(start + i * interval_ms + jitter)
+        raw = 22.0 + 3.0 * math.sin(i / 600.0) + rng.gauss(0, 0.05)
+        values.append(round(raw / 0.0625) * 0.0625)
+    return timestamps, values
+
+
+class TestSeriesRoundTrip:
+    """Tests de codificación y decodificación"""
+
+    def test_regular_series(self):
+        """Test serie regular"""
+        timestamps, values = temperature_trace(2000)
+        decoded_ts, decoded_values = decode_series(encode_series(timestamps, values))
+        assert decoded_ts == timestamps
+        assert decoded_values == values
+
+    def test_empty_and_single_point(self):
+        """Test series vacía y de un punto"""
+        assert decode_series(encode_series([], [])) == ([], [])
+        assert decode_series(encode_series([123], [4.5])) == ([123], [4.5])
+
+    def test_irregular_timestamps(self):
+        """Test timestamps irregulares, desordenados y negativos"""
+        timestamps = [0, 5, 5, 1_000_000, -3, 2**62, -(2**62), 17]
+        values = [1.0] * len(timestamps)
+        decoded_ts, _ = decode_series(encode_series(timestamps, values))
+        assert decoded_ts == timestamps
+
+    def test_special_floats(self):
+        """Test NaN, infinitos y cero negativo"""
+        values = [0.0, -0.0, math.inf, -math.inf, 1e-300, -1e300, 3.14159, math.nan]
+        timestamps = list(range(len(values)))
+        _, decoded = decode_series(encode_series(timestamps, values))
+        assert decoded[:-1] == values[:-1]
+        assert math.copysign(1.0, decoded[1]) == -1.0
+        assert math.isnan(decoded[-1])
+
+    def test_random_values(self):
+        """Test valores aleatorios sin estructura"""
+        rng = random.Random(1)
+        values = [rng.uniform(-1e6, 1e6) for _ in range(500)]
+        timestamps = [rng.randrange(0, 10**12) for _ in range(500)]
+        assert decode_series(encode_series(timestamps, values)) == (timestamps, values)
+
+    def test_compression_ratio(self):
+        """Test que una serie regular ocupa pocos bytes por punto"""
+        timestamps, values = temperature_trace(5000)
+        payload = encode_series(timestamps, values)
+        assert bytes_per_point(payload) < 3.0
+
+    def test_length_mismatch(self):
+        """Test longitudes distintas"""
+        with pytest.raises(ValueError):
+            encode_series([1, 2], [1.0])
+
+    def test_truncated_payload(self):
+        """Test payload truncado"""
+        payload = encode_series(*temperature_trace(100))
+        with pytest.raises(ValueError):
+            decode_series(payload[:20])
+        with pytest.raises(ValueError):
+            decode_series(b"\x01")
+
+    def test_unknown_version(self):
+        """Test versión de formato desconocida"""
+        payload = bytearray(encode_series([1], [1.0]))
+        payload[0] = 99
+        with pytest.raises(ValueError):
+            decode_series(bytes(payload))
+
+
+class TestSendSensorSeries:
+    """Tests para envío de series comprimidas"""
+
+    @patch('agenthub_iot.client.requests.post')
+    def test_send_sensor_series_success(self, mock_post):
+        """Test envío de serie comprimida"""
+        mock_response = Mock()
+        mock_response.status_code = 200
+        mock_response.json.return_value = {"received": True}
+        mock_response.headers = {"content-type": "application/json"}
+        mock_post.return_value = mock_response
+
+        timestamps, values = temperature_trace(60)
+        agent = AgentHub(TEST_AGENT_ID, TEST_PRIVATE_KEY)
+        result = agent.send_sensor_series(
+            endpoint="https://api.agenthub.protocol/api/iot/sensors",
+            timestamps=timestamps,
+            values=values,
+            sensor="temperature"
+        )
+
+        assert result["success"] is True
+        assert result["points"] == 60
+        call_args = mock_post.call_args
+        headers = call_args[1]["headers"]
+        assert headers["Content-Type"] == CONTENT_TYPE
+        assert headers["X-Agent-ID"] == TEST_AGENT_ID
+        assert headers["X-Sensor-Type"] == "temperature"
+        assert decode_series(call_args[1]["data"]) == (timestamps, values)
+
+    @patch('agenthub_iot.client.requests.post')
+    def test_send_sensor_series_invalid(self, mock_post):
+        """Test serie inválida"""
+        agent = AgentHub(TEST_AGENT_ID, TEST_PRIVATE_KEY)
+        result = agent.send_sensor_series("https://example.com", [1, 2], [1.0])
+        assert result["success"] is False
+        assert "error" in result
+        mock_post.assert_not_called()
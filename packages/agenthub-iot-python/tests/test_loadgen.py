@@ -0,0 +1,127 @@
+"""
+Tests for AgentHub IoT load generator
+"""
+
+import json
+import os
+import sys
+
+import pytest
+
+# Add parent directory to path
+src_path = os.path.join(os.path.dirname(__file__), '..', 'src')
+if src_path not in sys.path:
+    sys.path.insert(0, src_path)
+
+from agenthub_iot.loadgen import device_key, main, make_devices, run_load  # type: ignore[reportMissingImports]
+from agenthub_iot.standin import StandinServer  # type: ignore[reportMissingImports]
+from agenthub_iot.transport import RequestsTransport  # type: ignore[reportMissingImports]
+
+
+class TestDevices:
+    """Tests de identidades de dispositivos"""
+
+    def test_identities_are_deterministic_and_distinct(self):
+        """Test claves deterministas y direcciones distintas"""
+        assert device_key("fleet", 1) == device_key("fleet", 1)
+        devices = make_devices(5, "fleet")
+        assert len({device.get_address() for device in devices}) == 5
+        assert devices[3].get_agent_id() == "fleet-00003"
+
+
+class TestRunLoad:
+    """Tests del generador contra el stand-in"""
+
+    @pytest.mark.parametrize("shape", ["reading", "batch", "series"])
+    def test_payload_shapes(self, shape):
+        """Test que todas las formas de payload llegan al stand-in"""
+        with StandinServer() as server, RequestsTransport() as transport:
+            devices = make_devices(4, transport=transport)
+            summary = run_load(devices, server.url, rate=10, duration=0.5, shape=shape,
+                               batch_size=5, workers=8, interval=10)
+            stats = server.stats.snapshot()
+
+        assert summary["requests"] == 20
+        assert summary["errors"] == 0
+        assert summary["by_kind"] == {shape: 20}
+        assert stats["requests"] == {"/api/iot/sensors": 20}
+        assert summary["p99_ms"] >= summary["p50_ms"] >= 0
+
+    def test_series_path(self):
+        """Test que los lotes series van a series_path"""
+        with StandinServer() as server, RequestsTransport() as transport:
+            devices = make_devices(2, transport=transport)
+            run_load(devices, server.url, rate=10, duration=0.2, shape="series",
+                     workers=4, interval=10, series_path="/api/iot/series")
+            stats = server.stats.snapshot()
+        assert stats["requests"] == {"/api/iot/series": 4}
+
+    def test_alert_ratio_and_errors(self):
+        """Test alertas x402 y errores reportados"""
+        intervals = []
+        with StandinServer(error_rate=1.0) as server, RequestsTransport() as transport:
+            devices = make_devices(2, transport=transport)
+            summary = run_load(devices, server.url, rate=10, duration=0.5, alert_ratio=1.0,
+                               workers=4, interval=0.2, on_interval=intervals.append)
+
+        assert summary["by_kind"] == {"alert": 10}
+        assert summary["error_rate"] == 1.0
+        assert intervals and all("throughput" in interval for interval in intervals)
+
+    def test_invalid_arguments(self):
+        """Test argumentos inválidos"""
+        with pytest.raises(ValueError):
+            run_load([], "http://h", rate=1, duration=1)
+        with pytest.raises(ValueError):
+            run_load(make_devices(1), "http://h", rate=0, duration=1)
+        with pytest.raises(ValueError):
+            run_load(make_devices(1), "http://h", rate=1, duration=1, shape="xml")
+
+
+class TestCli:
+    """Tests del punto de entrada agenthub-iot-loadgen"""
+
+    def test_main_with_builtin_standin(self, capsys):
+        """Test CLI con el stand-in integrado y salida JSON"""
+        code = main(["--devices", "3", "--rate", "5", "--duration", "0.4",
+                     "--alert-ratio", "0", "--interval", "10", "--json"])
+        summary = json.loads(capsys.readouterr().out)
+        assert code == 0
+        assert summary["devices"] == 3
+        assert summary["requests"] == 6
+        assert summary["errors"] == 0
+
+    def test_http2_flag_with_http1_url(self, capsys):
+        """Test que --http2 contra un servidor HTTP/1.1 no pierde throughput"""
+        pytest.importorskip("httpx")
+        with StandinServer(latency=0.05) as server:
+            code = main(["--url", server.url, "--http2", "--devices", "100", "--rate", "2",
+                         "--duration", "1", "--alert-ratio", "0", "--interval", "10", "--json"])
+        summary = json.loads(capsys.readouterr().out)
+        assert code == 0
+        assert summary["requests"] == 200
+        assert summary["errors"] == 0
+        # Con 4 conexiones a 50 ms el techo serían 80 req/s y la cola crecería
+        assert summary["throughput"] > 150
+        assert summary["p95_ms"] < 250
+
+    def test_transport_sizing(self):
+        """Test del pool de conexiones según protocolo y --connections"""
+        pytest.importorskip("httpx")
+        from agenthub_iot.loadgen import build_parser, make_transport  # type: ignore[reportMissingImports]
+        from agenthub_iot.transport import Http2Transport  # type: ignore[reportMissingImports]
+
+        args = build_parser().parse_args(["--http2", "--workers", "32"])
+        transport = make_transport(args, "http://127.0.0.1:3000")
+        assert isinstance(transport, RequestsTransport)
+        transport.close()
+
+        transport = make_transport(args, "http://127.0.0.1:3000", builtin=True)
+        assert isinstance(transport, Http2Transport)
+        transport.close()
+
+        args = build_parser().parse_args(["--http2", "--connections", "8"])
+        transport = make_transport(args, "https://example.com")
+        assert isinstance(transport, Http2Transport)
+        assert transport.client._transport._pool._max_connections == 8
+        transport.close()
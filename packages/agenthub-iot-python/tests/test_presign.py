@@ -0,0 +1,137 @@
+"""
+Tests for AgentHub IoT x402 payment pre-signing
+"""
+
+import json
+import os
+import sys
+import time
+from unittest.mock import Mock, patch
+
+import pytest
+from eth_account import Account
+from eth_account.messages import encode_defunct
+
+# Add parent directory to path
+src_path = os.path.join(os.path.dirname(__file__), '..', 'src')
+if src_path not in sys.path:
+    sys.path.insert(0, src_path)
+
+from agenthub_iot import AgentHub  # type: ignore[reportMissingImports]
+from agenthub_iot.presign import PresignPool  # type: ignore[reportMissingImports]
+
+TEST_AGENT_ID = "test-iot-agent-001"
+TEST_PRIVATE_KEY = "0x" + "1" * 64
+ALERT_URL = "http://localhost:3000/api/iot/alerts"
+ENDPOINT = (ALERT_URL, "0.0001", "USDC", "basic")
+
+
+def mock_response():
+    response = Mock()
+    response.status_code = 200
+    response.json.return_value = {"success": True}
+    response.headers = {"content-type": "application/json"}
+    return response
+
+
+class TestPresignPool:
+    """Tests del pool de autorizaciones"""
+
+    def test_fill_and_take(self):
+        """Test que el pool se llena y cada autorización se usa una vez"""
+        agent = AgentHub(TEST_AGENT_ID, TEST_PRIVATE_KEY)
+        pool = PresignPool(agent, [ENDPOINT], pool_size=3)
+        assert pool.fill() == 3
+        assert pool.available() == {ENDPOINT: 3}
+
+        headers = {pool.take(*ENDPOINT) for _ in range(3)}
+        assert None not in headers
+        assert pool.take(*ENDPOINT) is None
+        assert pool.hits == 3
+        assert pool.misses == 1
+
+    def test_presigned_header_is_valid_signature(self):
+        """Test que la cabecera pre-firmada verifica con la dirección del agente"""
+        agent = AgentHub(TEST_AGENT_ID, TEST_PRIVATE_KEY)
+        pool = PresignPool(agent, [ENDPOINT], pool_size=1)
+        pool.fill()
+        payment = json.loads(pool.take(*ENDPOINT))
+
+        message = f"{payment['resourceUrl']}{payment['amount']}{payment['timestamp']}"
+        signer = Account.recover_message(encode_defunct(text=message), signature=payment["signature"])
+        assert signer == agent.get_address()
+        assert payment["agentId"] == TEST_AGENT_ID
+        assert payment["tier"] == "basic"
+
+    def test_stale_authorizations_are_discarded(self):
+        """Test que las autorizaciones caducadas no se entregan y se renuevan"""
+        agent = AgentHub(TEST_AGENT_ID, TEST_PRIVATE_KEY)
+        pool = PresignPool(agent, [ENDPOINT], pool_size=2, max_age=0.05)
+        pool.fill()
+        time.sleep(0.1)
+        assert pool.take(*ENDPOINT) is None
+        assert pool.fill() == 2
+        assert pool.take(*ENDPOINT) is not None
+
+    def test_unknown_endpoint(self):
+        """Test endpoint no configurado"""
+        agent = AgentHub(TEST_AGENT_ID, TEST_PRIVATE_KEY)
+        pool = PresignPool(agent, [ENDPOINT], pool_size=1)
+        assert pool.take("http://other", "0.0001", "USDC", "basic") is None
+
+    def test_background_refill(self):
+        """Test que el hilo repone las autorizaciones usadas"""
+        agent = AgentHub(TEST_AGENT_ID, TEST_PRIVATE_KEY)
+        pool = PresignPool(agent, [ENDPOINT], pool_size=2, refresh_interval=5).start()
+        try:
+            pool.take(*ENDPOINT)
+            deadline = time.time() + 5
+            while pool.available()[ENDPOINT] < 2 and time.time() < deadline:
+                time.sleep(0.01)
+            assert pool.available()[ENDPOINT] == 2
+        finally:
+            pool.stop()
+
+    def test_invalid_arguments(self):
+        """Test argumentos inválidos"""
+        with pytest.raises(ValueError):
+            PresignPool(Mock(), [ENDPOINT], pool_size=0)
+        with pytest.raises(ValueError):
+            PresignPool(Mock(), [ENDPOINT], max_age=0)
+
+
+class TestAgentHubPresigning:
+    """Tests de x402_request con pool pre-firmado"""
+
+    @patch('agenthub_iot.client.requests.post')
+    def test_x402_request_uses_presigned_header(self, mock_post):
+        """Test que x402_request usa la autorización del pool sin firmar"""
+        mock_post.return_value = mock_response()
+        agent = AgentHub(TEST_AGENT_ID, TEST_PRIVATE_KEY)
+        pool = agent.start_presigning([ENDPOINT], pool_size=1)
+        try:
+            with patch.object(agent, "_sign_message", wraps=agent._sign_message) as sign:
+                pool.stop()  # sin reposición en segundo plano durante el test
+                result = agent.x402_request(ALERT_URL, "0.0001", {"alert": "x"})
+                assert sign.call_count == 0
+        finally:
+            agent.stop_presigning()
+
+        assert result["success"] is True
+        payment = json.loads(mock_post.call_args[1]["headers"]["x-payment"])
+        assert payment["resourceUrl"] == ALERT_URL
+        assert pool.hits == 1
+
+    @patch('agenthub_iot.client.requests.post')
+    def test_x402_request_falls_back_to_inline_signing(self, mock_post):
+        """Test que sin autorización disponible se firma en línea"""
+        mock_post.return_value = mock_response()
+        agent = AgentHub(TEST_AGENT_ID, TEST_PRIVATE_KEY)
+        agent.start_presigning([ENDPOINT], pool_size=1)
+        try:
+            with patch.object(agent, "_sign_message", wraps=agent._sign_message) as sign:
+                agent.x402_request(ALERT_URL, "0.0001", tier="premium")
+                assert sign.call_count == 1
+        finally:
+            agent.stop_presigning()
+        assert agent._presign_pool is None
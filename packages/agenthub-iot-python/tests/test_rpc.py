@@ -0,0 +1,232 @@
+"""
+Tests for AgentHub IoT RPC endpoint pool
+"""
+
+import json
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+# Add parent directory to path
+src_path = os.path.join(os.path.dirname(__file__), '..', 'src')
+if src_path not in sys.path:
+    sys.path.insert(0, src_path)
+
+from agenthub_iot import AgentHub, RpcEndpointPool  # type: ignore[reportMissingImports]
+from agenthub_iot.rpc import RpcError  # type: ignore[reportMissingImports]
+
+TEST_AGENT_ID = "test-iot-agent-001"
+TEST_PRIVATE_KEY = "0x" + "1" * 64
+FUJI_CHAIN_ID = 43113
+
+
+class FakeRpcNode:
+    """Nodo JSON-RPC local con latencia y fallos configurables"""
+
+    def __init__(self, block_number, delay=0.0, status=200, fail_every=0):
+        self.block_number = block_number
+        self.delay = delay
+        self.status = status
+        # Con fail_every=n, una de cada n peticiones responde 503
+        self.fail_every = fail_every
+        self.calls = []
+        node = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                request = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+                node.calls.append(request["method"])
+                if node.delay:
+                    time.sleep(node.delay)
+                results = {
+                    "eth_chainId": hex(FUJI_CHAIN_ID),
+                    "eth_blockNumber": hex(node.block_number),
+                    "eth_sendRawTransaction": "0x" + "ab" * 32,
+                }
+                body = json.dumps({
+                    "jsonrpc": "2.0",
+                    "id": request["id"],
+                    "result": results.get(request["method"], "0x0"),
+                }).encode()
+                status = node.status
+                if node.fail_every and len(node.calls) % node.fail_every == 0:
+                    status = 503
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.server.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@pytest.fixture
+def nodes():
+    created = []
+
+    def make(*args, **kwargs):
+        node = FakeRpcNode(*args, **kwargs)
+        created.append(node)
+        return node
+
+    yield make
+    for node in created:
+        node.stop()
+
+
+class TestRpcEndpointPoolRouting:
+    """Tests de selección por latencia y failover"""
+
+    def test_routes_to_fastest_endpoint(self, nodes):
+        """Test que el endpoint más rápido acaba recibiendo las peticiones"""
+        slow, fast = nodes(1, delay=0.05), nodes(2)
+        pool = RpcEndpointPool([slow.url, fast.url])
+        for _ in range(10):
+            pool.request("eth_blockNumber")
+        assert pool.ranked()[0].url == fast.url
+        assert len(fast.calls) >= 8
+        assert len(slow.calls) <= 2
+        pool.close()
+
+    def test_failover_on_server_error(self, nodes):
+        """Test failover y salida de rotación tras fallos seguidos"""
+        broken, healthy = nodes(1, status=500), nodes(2)
+        pool = RpcEndpointPool([broken.url, healthy.url], failure_threshold=1, cooldown=0.1)
+        for _ in range(3):
+            assert pool.request("eth_blockNumber")["result"] == hex(2)
+        status = {entry["url"]: entry for entry in pool.status()}
+        assert status[broken.url]["healthy"] is False
+        assert status[broken.url]["errors"] == 1
+        assert status[healthy.url]["healthy"] is True
+        assert pool.ranked()[-1].url == broken.url
+
+        # Tras el cooldown vuelve a rotación
+        time.sleep(0.15)
+        status = {entry["url"]: entry for entry in pool.status()}
+        assert status[broken.url]["healthy"] is True
+        pool.close()
+
+    def test_failover_on_connection_refused(self, nodes):
+        """Test failover cuando un nodo no acepta conexiones"""
+        dead = nodes(1)
+        dead.stop()
+        alive = nodes(2)
+        pool = RpcEndpointPool([dead.url, alive.url])
+        assert pool.request("eth_sendRawTransaction", ["0x00"])["result"] == "0x" + "ab" * 32
+        pool.close()
+
+    def test_writes_do_not_fail_over_on_server_error(self, nodes):
+        """Test que una escritura no se reenvía si el nodo pudo procesarla"""
+        broken, healthy = nodes(1, status=500), nodes(2)
+        pool = RpcEndpointPool([broken.url, healthy.url])
+        with pytest.raises(RpcError):
+            pool.request("eth_sendRawTransaction", ["0x00"])
+        assert healthy.calls == []
+        pool.close()
+
+    @pytest.mark.parametrize("status", [429, 502, 503])
+    def test_writes_fail_over_when_not_accepted(self, nodes, status):
+        """Test que una escritura rechazada por el nodo se reenvía a otro"""
+        busy, healthy = nodes(1, status=status), nodes(2)
+        pool = RpcEndpointPool([busy.url, healthy.url])
+        assert pool.request("eth_sendRawTransaction", ["0x00"])["result"] == "0x" + "ab" * 32
+        assert healthy.calls == ["eth_sendRawTransaction"]
+        pool.close()
+
+    def test_flaky_fast_node_does_not_lose_writes(self, nodes):
+        """Test que un nodo rápido que falla la mitad de las veces no gana al sano"""
+        healthy, flaky = nodes(1, delay=0.05), nodes(2, fail_every=2)
+        pool = RpcEndpointPool([healthy.url, flaky.url])
+        for _ in range(20):
+            assert pool.request("eth_sendRawTransaction", ["0x00"])["result"] == "0x" + "ab" * 32
+        assert pool.ranked()[0].url == healthy.url
+        status = {entry["url"]: entry for entry in pool.status()}
+        assert status[flaky.url]["healthy"] is False
+        # La latencia solo refleja respuestas correctas
+        assert status[healthy.url]["latency"] >= 0.05
+        pool.close()
+
+    def test_never_successful_node_stays_behind_after_cooldown(self, nodes):
+        """Test que un nodo que nunca ha respondido bien no vuelve delante al acabar el cooldown"""
+        healthy, broken = nodes(1, delay=0.05), nodes(2, status=500)
+        pool = RpcEndpointPool([broken.url, healthy.url], failure_threshold=1, cooldown=0.05)
+        # Lectura inicial: el nodo roto falla (queda en cooldown) y el sano queda medido
+        assert pool.request("eth_blockNumber")["result"] == hex(1)
+        for _ in range(10):
+            time.sleep(0.06)
+            assert pool.request("eth_sendRawTransaction", ["0x00"])["result"] == "0x" + "ab" * 32
+        assert pool.ranked()[0].url == healthy.url
+        assert broken.calls == ["eth_blockNumber"]
+        pool.close()
+
+    def test_all_endpoints_fail(self, nodes):
+        """Test error cuando ningún endpoint responde"""
+        pool = RpcEndpointPool([nodes(1, status=500).url, nodes(2, status=503).url])
+        with pytest.raises(RpcError):
+            pool.request("eth_blockNumber")
+        pool.close()
+
+    def test_invalid_arguments(self):
+        """Test argumentos inválidos"""
+        with pytest.raises(ValueError):
+            RpcEndpointPool([])
+        with pytest.raises(ValueError):
+            RpcEndpointPool(["http://h"], alpha=0)
+
+
+class TestRpcEndpointPoolHedging:
+    """Tests de lecturas hedged"""
+
+    def test_slow_read_is_hedged(self, nodes):
+        """Test que una lectura lenta se duplica y gana el nodo rápido"""
+        stalled, fast = nodes(1, delay=1.0), nodes(2)
+        pool = RpcEndpointPool([stalled.url, fast.url], hedge_reads=True, hedge_after=0.05)
+        start = time.monotonic()
+        result = pool.request("eth_blockNumber")
+        elapsed = time.monotonic() - start
+        assert result["result"] == hex(2)
+        assert elapsed < 0.5
+        assert pool.hedges == 1
+        pool.close()
+
+    def test_writes_are_not_hedged(self, nodes):
+        """Test que las escrituras no se duplican"""
+        stalled, fast = nodes(1, delay=0.2), nodes(2)
+        pool = RpcEndpointPool([stalled.url, fast.url], hedge_reads=True, hedge_after=0.01)
+        pool.request("eth_sendRawTransaction", ["0x00"])
+        assert fast.calls == []
+        assert pool.hedges == 0
+        pool.close()
+
+
+class TestAgentHubRpcPool:
+    """Tests de AgentHub con varios nodos RPC"""
+
+    def test_agent_uses_pool(self, nodes):
+        """Test _make_rpc_request y web3 a través del pool"""
+        broken, healthy = nodes(1, status=500), nodes(7)
+        agent = AgentHub(TEST_AGENT_ID, TEST_PRIVATE_KEY, rpc_urls=[broken.url, healthy.url])
+        assert agent.rpc_url == broken.url
+        assert agent._make_rpc_request("eth_blockNumber", [])["result"] == hex(7)
+        assert agent.web3.eth.chain_id == FUJI_CHAIN_ID
+        agent.rpc_pool.close()
+
+    def test_agent_pool_error(self, nodes):
+        """Test que _make_rpc_request devuelve error si todo falla"""
+        agent = AgentHub(TEST_AGENT_ID, TEST_PRIVATE_KEY, rpc_urls=[nodes(1, status=500).url])
+        assert "error" in agent._make_rpc_request("eth_blockNumber", [])
+        agent.rpc_pool.close()
@@ -0,0 +1,268 @@
+"""
+Tests for AgentHub IoT edge rule engine
+"""
+
+import os
+import random
+import sys
+from unittest.mock import Mock
+
+import pytest
+
+# Add parent directory to path
+src_path = os.path.join(os.path.dirname(__file__), '..', 'src')
+if src_path not in sys.path:
+    sys.path.insert(0, src_path)
+
+from agenthub_iot import RuleEngine, UplinkScheduler  # type: ignore[reportMissingImports]
+
+
+def names(alerts):
+    return [alert["rule"] for alert in alerts]
+
+
+class TestThresholdRules:
+    """Tests de reglas de umbral"""
+
+    def test_threshold_with_cooldown(self):
+        """Test umbral con cooldown"""
+        engine = RuleEngine([{
+            "name": "high_temp", "sensor": "temperature", "type": "threshold",
+            "op": ">", "value": 30.0, "cooldown": 300,
+        }])
+        assert engine.evaluate("temperature", 29.0, 0) == []
+        assert names(engine.evaluate("temperature", 31.0, 10)) == ["high_temp"]
+        assert engine.evaluate("temperature", 32.0, 100) == []
+        assert names(engine.evaluate("temperature", 32.0, 310)) == ["high_temp"]
+
+    @pytest.mark.parametrize("op", [">", ">=", "<", "<="])
+    def test_threshold_ops_match_bruteforce(self, op):
+        """Test que la búsqueda binaria coincide con evaluar regla a regla"""
+        rng = random.Random(op)
+        limits = [round(rng.uniform(0, 50), 1) for _ in range(300)]
+        rules = [
+            {"name": f"r{i}", "sensor": "t", "type": "threshold", "op": op, "value": limit}
+            for i, limit in enumerate(limits)
+        ]
+        engine = RuleEngine(rules)
+        compare = {">": float.__gt__, ">=": float.__ge__, "<": float.__lt__, "<=": float.__le__}[op]
+        for step, value in enumerate([0.0, 10.0, limits[0], 25.5, 50.0]):
+            fired = set(names(engine.evaluate("t", value, float(step))))
+            expected = {f"r{i}" for i, limit in enumerate(limits) if compare(value, limit)}
+            assert fired == expected
+
+    def test_unknown_sensor(self):
+        """Test sensor sin reglas"""
+        engine = RuleEngine([{"name": "a", "sensor": "t", "type": "threshold", "value": 1}])
+        assert engine.evaluate("humidity", 99.0, 0) == []
+
+
+class TestStatefulRules:
+    """Tests de histéresis, tasa de cambio y ventanas"""
+
+    def test_hysteresis(self):
+        """Test histéresis: dispara en high y se rearma bajo low"""
+        engine = RuleEngine([{
+            "name": "overheat", "sensor": "t", "type": "hysteresis", "high": 30, "low": 28,
+        }])
+        fired = [bool(engine.evaluate("t", v, i)) for i, v in enumerate([31, 32, 29, 31, 27, 31])]
+        assert fired == [True, False, False, False, False, True]
+
+    def test_hysteresis_below(self):
+        """Test histéresis hacia abajo"""
+        engine = RuleEngine([{
+            "name": "freeze", "sensor": "t", "type": "hysteresis",
+            "high": 2, "low": 0, "direction": "below",
+        }])
+        fired = [bool(engine.evaluate("t", v, i)) for i, v in enumerate([-1, -2, 1, 3, -1])]
+        assert fired == [True, False, False, False, True]
+
+    def test_rate_of_change(self):
+        """Test tasa de cambio por segundo"""
+        engine = RuleEngine([{
+            "name": "fast_rise", "sensor": "t", "type": "rate",
+            "op": ">", "value": 0.1, "window": 10,
+        }])
+        assert engine.evaluate("t", 20.0, 0) == []
+        assert engine.evaluate("t", 20.5, 10) == []
+        alerts = engine.evaluate("t", 23.0, 20)
+        assert names(alerts) == ["fast_rise"]
+        assert alerts[0]["observed"] == pytest.approx(0.25)
+
+    def test_window_requires_full_window(self):
+        """Test agregado de ventana solo con la ventana completa"""
+        engine = RuleEngine([{
+            "name": "sustained", "sensor": "t", "type": "window",
+            "agg": "min", "op": ">", "value": 29, "window": 60,
+        }])
+        assert engine.evaluate("t", 31, 0) == []
+        assert engine.evaluate("t", 31, 30) == []
+        assert names(engine.evaluate("t", 31, 60)) == ["sustained"]
+        engine.evaluate("t", 28, 70)
+        assert engine.evaluate("t", 31, 100) == []
+        assert names(engine.evaluate("t", 31, 131)) == ["sustained"]
+
+    def test_window_aggregates(self):
+        """Test avg y max compartiendo ventana"""
+        engine = RuleEngine([
+            {"name": "avg", "sensor": "t", "type": "window", "agg": "avg",
+             "op": ">=", "value": 2, "window": 2},
+            {"name": "max", "sensor": "t", "type": "window", "agg": "max",
+             "op": ">=", "value": 3, "window": 2},
+        ])
+        assert len(engine.programs["t"].windows) == 1
+        engine.evaluate("t", 1, 0)
+        engine.evaluate("t", 2, 1)
+        alerts = engine.evaluate("t", 3, 2)
+        assert sorted(names(alerts)) == ["avg", "max"]
+
+
+class TestRuleCompilation:
+    """Tests de validación de reglas"""
+
+    @pytest.mark.parametrize("rule", [
+        {"name": "a", "sensor": "t", "type": "unknown"},
+        {"name": "a", "sensor": "t", "type": "threshold"},
+        {"name": "a", "sensor": "t", "type": "threshold", "op": "!=", "value": 1},
+        {"name": "a", "sensor": "t", "type": "hysteresis", "high": 1, "low": 2},
+        {"name": "a", "sensor": "t", "type": "window", "value": 1, "window": 0},
+        {"name": "a", "sensor": "t", "type": "window", "agg": "sum", "value": 1, "window": 5},
+        {"sensor": "t", "type": "threshold", "value": 1},
+    ])
+    def test_invalid_rules(self, rule):
+        """Test reglas inválidas"""
+        with pytest.raises(ValueError):
+            RuleEngine([rule])
+
+    def test_duplicate_names(self):
+        """Test nombres duplicados"""
+        rule = {"name": "a", "sensor": "t", "type": "threshold", "value": 1}
+        with pytest.raises(ValueError):
+            RuleEngine([rule, dict(rule)])
+
+
+class TestRuleSources:
+    """Tests de estado por fuente"""
+
+    def test_sources_have_independent_state(self):
+        """Test que ventanas y cooldown se llevan por fuente"""
+        engine = RuleEngine([
+            {"name": "sustained", "sensor": "t", "type": "window",
+             "agg": "min", "op": ">", "value": 30.0, "window": 60, "cooldown": 300},
+        ])
+        for step in range(3):
+            assert engine.evaluate("t", 20.0, step * 30.0, source="a") == []
+            alerts = engine.evaluate("t", 35.0, step * 30.0, source="b")
+        assert [alert["source"] for alert in alerts] == ["b"]
+        assert engine.evaluate("t", 35.0, 120.0, source="b") == []
+        assert names(engine.evaluate("t", 35.0, 0.0)) == []
+
+
+class TestRuleAlerts:
+    """Tests de envío de alertas x402"""
+
+    def test_alert_sent_with_x402(self):
+        """Test que una regla disparada llama a x402_request"""
+        agent = Mock()
+        agent.ALERTS_API = "http://localhost:3000/api/iot/alerts"
+        agent.get_agent_id.return_value = "temp-monitor-001"
+        engine = RuleEngine([{
+            "name": "high_temp", "sensor": "temperature", "type": "threshold",
+            "value": 30.0, "alert": "high_temperature", "data": {"zone": "A"},
+        }], agent=agent, amount="0.0002")
+
+        engine.evaluate("temperature", 31.5, 1.0)
+
+        agent.x402_request.assert_called_once()
+        url, amount, data = agent.x402_request.call_args[0]
+        assert url == agent.ALERTS_API
+        assert amount == "0.0002"
+        assert data["alert"] == "high_temperature"
+        assert data["agentId"] == "temp-monitor-001"
+        assert data["temperature"] == 31.5
+        assert data["threshold"] == 30.0
+        assert data["zone"] == "A"
+        assert data["timestamp"] == 1000
+
+    def test_alert_through_scheduler(self):
+        """Test que las alertas se encolan en el scheduler si existe"""
+        agent = Mock()
+        agent.ALERTS_API = "http://h/alerts"
+        agent.get_agent_id.return_value = "a"
+        scheduler = Mock()
+        engine = RuleEngine(
+            [{"name": "r", "sensor": "t", "type": "threshold", "value": 0, "url": "http://h/custom"}],
+            agent=agent, scheduler=scheduler,
+        )
+        engine.evaluate("t", 1.0, 0)
+        scheduler.x402_request.assert_called_once()
+        assert scheduler.x402_request.call_args[0][0] == "http://h/custom"
+        agent.x402_request.assert_not_called()
+
+    def test_failed_send_does_not_start_cooldown(self):
+        """Test que una alerta no enviada no consume el cooldown"""
+        agent = Mock()
+        agent.ALERTS_API = "http://h/alerts"
+        agent.get_agent_id.return_value = "a"
+        agent.x402_request.return_value = {"success": False, "error": "unreachable"}
+        engine = RuleEngine([{
+            "name": "high_temp", "sensor": "temperature", "type": "threshold",
+            "value": 30.0, "cooldown": 300,
+        }], agent=agent)
+
+        alerts = engine.evaluate("temperature", 35.0, 0)
+        assert alerts[0]["result"] == {"success": False, "error": "unreachable"}
+        assert "result" not in agent.x402_request.call_args[0][2]
+
+        agent.x402_request.return_value = {"success": True}
+        alerts = engine.evaluate("temperature", 35.0, 60)
+        assert alerts[0]["result"] == {"success": True}
+        assert engine.evaluate("temperature", 35.0, 120) == []
+
+    def test_failed_send_keeps_hysteresis_armed(self):
+        """Test que una histéresis cuyo envío falla se reintenta sin bajar de low"""
+        agent = Mock()
+        agent.ALERTS_API = "http://h/alerts"
+        agent.get_agent_id.return_value = "a"
+        agent.x402_request.side_effect = [{"success": False}, {"success": True}]
+        engine = RuleEngine([{
+            "name": "overheat", "sensor": "t", "type": "hysteresis", "high": 30.0, "low": 28.0,
+        }], agent=agent)
+
+        attempts = [len(engine.evaluate("t", v, float(i))) for i, v in enumerate([31, 32, 33, 34])]
+        assert attempts == [1, 1, 0, 0]
+        assert agent.x402_request.call_count == 2
+
+    def test_hysteresis_crossing_not_consumed_in_cooldown(self):
+        """Test que un cruce durante el cooldown sigue pendiente al terminar"""
+        engine = RuleEngine([{
+            "name": "overheat", "sensor": "t", "type": "hysteresis",
+            "high": 30.0, "low": 28.0, "cooldown": 100,
+        }])
+        assert names(engine.evaluate("t", 31.0, 0)) == ["overheat"]
+        assert engine.evaluate("t", 27.0, 10) == []
+        assert engine.evaluate("t", 31.0, 20) == []
+        assert names(engine.evaluate("t", 31.0, 110)) == ["overheat"]
+        assert engine.evaluate("t", 31.0, 220) == []
+
+    def test_scheduler_cooldown_starts_on_completion(self):
+        """Test que con scheduler el cooldown empieza al confirmarse el envío"""
+        agent = Mock()
+        agent.ALERTS_API = "http://h/alerts"
+        agent.get_agent_id.return_value = "a"
+        agent.x402_request.side_effect = [{"success": False}, {"success": True}]
+        rules = [{"name": "r", "sensor": "t", "type": "threshold", "value": 0, "cooldown": 300}]
+        scheduler = UplinkScheduler(agent)
+        engine = RuleEngine(rules, agent=agent, scheduler=scheduler)
+
+        first = engine.evaluate("t", 1.0, 0)
+        # Pendiente de envío: no se vuelve a encolar
+        assert engine.evaluate("t", 1.0, 1) == []
+        # Al parar, el hilo emisor ya ha ejecutado los callbacks de los futures
+        with scheduler:
+            pass
+        assert first[0]["result"].result(5) == {"success": False}
+        with scheduler:
+            second = engine.evaluate("t", 1.0, 2)
+        assert second[0]["result"].result(5) == {"success": True}
+        assert engine.evaluate("t", 1.0, 3) == []
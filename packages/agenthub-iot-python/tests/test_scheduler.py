@@ -0,0 +1,175 @@
+"""
+Tests for AgentHub IoT uplink scheduler
+"""
+
+import os
+import sys
+import threading
+import time
+from unittest.mock import Mock
+
+import pytest
+
+# Add parent directory to path
+src_path = os.path.join(os.path.dirname(__file__), '..', 'src')
+if src_path not in sys.path:
+    sys.path.insert(0, src_path)
+
+from agenthub_iot import UplinkScheduler, decode_series  # type: ignore[reportMissingImports]
+
+
+def make_agent(calls, gate=None):
+    """Agente falso que registra el orden de envío"""
+    agent = Mock()
+
+    def x402_request(url, amount, data=None, token="USDC", tier="basic"):
+        calls.append(("alert", data))
+        return {"success": True}
+
+    def send_sensor_data(endpoint, data):
+        if gate is not None:
+            gate.wait(5)
+        calls.append(("telemetry", data))
+        return {"success": True}
+
+    def send_series_payload(endpoint, payload, points, sensor=None):
+        if gate is not None:
+            gate.wait(5)
+        timestamps, _ = decode_series(payload)
+        calls.append(("bulk", timestamps[0]))
+        return {"success": True, "points": points}
+
+    agent.x402_request.side_effect = x402_request
+    agent.send_sensor_data.side_effect = send_sensor_data
+    agent.send_series_payload.side_effect = send_series_payload
+    return agent
+
+
+class TestUplinkSchedulerOrdering:
+    """Tests de orden por prioridad"""
+
+    def test_alert_preempts_bulk_upload(self):
+        """Test que una alerta se envía entre trozos de un lote en curso"""
+        calls = []
+        gate = threading.Event()
+        scheduler = UplinkScheduler(make_agent(calls, gate), chunk_points=10).start()
+        try:
+            timestamps = list(range(50))
+            bulk = scheduler.send_sensor_series("http://h/s", timestamps, [1.0] * 50)
+            time.sleep(0.05)  # primer trozo en curso, bloqueado en gate
+            alert = scheduler.x402_request("http://h/a", "0.0001", {"id": 1})
+            gate.set()
+            assert alert.result(5) == {"success": True}
+            results = bulk.result(5)
+        finally:
+            scheduler.stop()
+
+        assert len(results) == 5
+        assert calls[0] == ("bulk", 0)
+        assert calls[1] == ("alert", {"id": 1})
+        assert [c[1] for c in calls[2:]] == [10, 20, 30, 40]
+
+    def test_priority_classes_order(self):
+        """Test orden alert > telemetry > bulk con la cola llena"""
+        calls = []
+        scheduler = UplinkScheduler(make_agent(calls), chunk_points=100)
+        bulk = scheduler.send_sensor_series("http://h/s", [1, 2], [1.0, 2.0])
+        telemetry = scheduler.send_sensor_data("http://h/s", {"t": 1})
+        alert = scheduler.x402_request("http://h/a", "0.0001", {"id": 1})
+        assert scheduler.pending() == {"alert": 1, "telemetry": 1, "bulk": 1}
+
+        with scheduler:
+            for future in (bulk, telemetry, alert):
+                future.result(5)
+
+        assert [c[0] for c in calls] == ["alert", "telemetry", "bulk"]
+
+    def test_unknown_priority(self):
+        """Test clase de prioridad desconocida"""
+        scheduler = UplinkScheduler(Mock())
+        with pytest.raises(ValueError):
+            scheduler.submit(lambda: None, priority="urgent")
+
+    def test_exception_propagates_to_future(self):
+        """Test que una excepción del envío llega al future"""
+        with UplinkScheduler(Mock()) as scheduler:
+            def fail():
+                raise RuntimeError("boom")
+            future = scheduler.submit(fail)
+            with pytest.raises(RuntimeError):
+                future.result(5)
+
+    def test_submit_after_stop(self):
+        """Test que no se puede encolar en un planificador detenido"""
+        scheduler = UplinkScheduler(Mock()).start()
+        scheduler.stop()
+        with pytest.raises(RuntimeError):
+            scheduler.send_sensor_data("http://h/s", {"t": 1})
+
+    def test_stop_never_started_cancels(self):
+        """Test que stop() sin hilo emisor no deja futures colgados"""
+        scheduler = UplinkScheduler(Mock())
+        future = scheduler.send_sensor_data("http://h/s", {"t": 1})
+        scheduler.stop()
+        assert future.cancelled()
+
+    def test_series_encoded_once(self):
+        """Test que cada trozo se codifica una vez y se envía ya codificado"""
+        calls = []
+        agent = make_agent(calls)
+        with UplinkScheduler(agent, chunk_points=10) as scheduler:
+            scheduler.send_sensor_series("http://h/s", list(range(25)), [1.0] * 25).result(5)
+        assert [c[1] for c in calls] == [0, 10, 20]
+        assert [call.args[2] for call in agent.send_series_payload.call_args_list] == [10, 10, 5]
+        agent.send_sensor_series.assert_not_called()
+
+    def test_stop_without_drain_cancels(self):
+        """Test que stop(drain=False) cancela lo pendiente"""
+        scheduler = UplinkScheduler(Mock())
+        future = scheduler.send_sensor_data("http://h/s", {"t": 1})
+        scheduler.stop(drain=False)
+        assert future.cancelled()
+
+
+class TestUplinkSchedulerBandwidth:
+    """Tests del presupuesto de ancho de banda"""
+
+    def test_bulk_waits_for_budget_but_alert_does_not(self):
+        """Test que la telemetría espera tokens y la alerta no"""
+        calls = []
+        scheduler = UplinkScheduler(make_agent(calls), bandwidth=1000, burst=100)
+        scheduler._tokens = 0.0
+        telemetry = scheduler.send_sensor_data("http://h/s", {"payload": "x" * 80})
+
+        with scheduler:
+            time.sleep(0.02)  # telemetría esperando presupuesto
+            alert = scheduler.x402_request("http://h/a", "0.0001", {"id": 1})
+            alert.result(5)
+            telemetry.result(5)
+
+        assert [c[0] for c in calls] == ["alert", "telemetry"]
+
+    def test_invalid_bandwidth(self):
+        """Test presupuesto inválido"""
+        with pytest.raises(ValueError):
+            UplinkScheduler(Mock(), bandwidth=0)
+
+
+class TestUplinkSchedulerMetrics:
+    """Tests de métricas por clase"""
+
+    def test_metrics_per_class(self):
+        """Test latencias y contadores por clase"""
+        calls = []
+        with UplinkScheduler(make_agent(calls)) as scheduler:
+            scheduler.x402_request("http://h/a", "0.0001", {"id": 1}).result(5)
+            scheduler.send_sensor_data("http://h/s", {"t": 1}).result(5)
+
+        metrics = scheduler.metrics()
+        assert set(metrics) == {"alert", "telemetry", "bulk"}
+        assert metrics["alert"]["sent"] == 1
+        assert metrics["telemetry"]["sent"] == 1
+        assert metrics["bulk"]["sent"] == 0
+        assert metrics["telemetry"]["bytes"] > 0
+        for key in ("latency_avg", "latency_max", "latency_p50", "latency_p95"):
+            assert metrics["alert"][key] >= 0.0
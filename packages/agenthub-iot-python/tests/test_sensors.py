@@ -0,0 +1,237 @@
+"""
+Tests for AgentHub IoT sensor drivers
+"""
+
+import asyncio
+import os
+import sys
+import time
+
+import pytest
+
+# Add parent directory to path
+src_path = os.path.join(os.path.dirname(__file__), '..', 'src')
+if src_path not in sys.path:
+    sys.path.insert(0, src_path)
+
+from agenthub_iot import AgentHub, RuleEngine, SensorBus  # type: ignore[reportMissingImports]
+from agenthub_iot.sensors import IioChannel, Sensor, SensorError, W1Therm, discover  # type: ignore[reportMissingImports]
+from agenthub_iot.standin import StandinServer  # type: ignore[reportMissingImports]
+
+TEST_AGENT_ID = "test-iot-agent-001"
+TEST_PRIVATE_KEY = "0x" + "1" * 64
+
+
+def w1_slave(millicelsius, crc_ok=True):
+    return (f"72 01 4b 46 7f ff 0e 10 57 : crc=57 {'YES' if crc_ok else 'NO'}\n"
+            f"72 01 4b 46 7f ff 0e 10 57 t={millicelsius}\n")
+
+
+def add_w1_device(root, device_id, millicelsius, crc_ok=True, master="w1_bus_master1"):
+    """Crear un termómetro como lo expone el kernel: enlace desde /sys/bus/w1/devices"""
+    device_dir = root / "sys" / "devices" / master / device_id
+    device_dir.mkdir(parents=True)
+    (device_dir / "w1_slave").write_text(w1_slave(millicelsius, crc_ok))
+    links = root / "sys" / "bus" / "w1" / "devices"
+    links.mkdir(parents=True, exist_ok=True)
+    (links / device_id).symlink_to(device_dir)
+    return device_dir
+
+
+@pytest.fixture
+def sysfs(tmp_path):
+    """Árbol sysfs falso con dos DS18B20, un dispositivo 1-Wire que no es termómetro y un IIO"""
+    add_w1_device(tmp_path, "28-000000000001", 21500)
+    add_w1_device(tmp_path, "28-000000000002", -1250)
+    add_w1_device(tmp_path, "01-000000000003", 0)
+    (tmp_path / "sys" / "devices" / "w1_bus_master1" / "therm_bulk_read").write_text("0\n")
+
+    iio = tmp_path / "sys" / "bus" / "iio" / "devices" / "iio:device0"
+    iio.mkdir(parents=True)
+    (iio / "name").write_text("bme280\n")
+    (iio / "in_temp_raw").write_text("2500\n")
+    (iio / "in_temp_offset").write_text("-500\n")
+    (iio / "in_temp_scale").write_text("10\n")
+    (iio / "in_humidityrelative_input").write_text("45250\n")
+    return tmp_path
+
+
+class TestDrivers:
+    """Tests de parseo de cada driver"""
+
+    def test_w1_therm(self, sysfs):
+        """Test lectura de w1_slave, incluidas temperaturas negativas"""
+        devices = sysfs / "sys" / "bus" / "w1" / "devices"
+        assert W1Therm(str(devices / "28-000000000001")).read() == 21.5
+        sensor = W1Therm(str(devices / "28-000000000002"))
+        assert sensor.read() == -1.25
+        assert sensor.bulk_read_path.endswith("w1_bus_master1/therm_bulk_read")
+
+    def test_w1_therm_rereads_same_file(self, sysfs):
+        """Test que el atributo abierto se relee tras cambiar"""
+        device = sysfs / "sys" / "bus" / "w1" / "devices" / "28-000000000001"
+        sensor = W1Therm(str(device))
+        assert sensor.read() == 21.5
+        with open(device / "w1_slave", "r+") as f:
+            f.write(w1_slave(22000))
+        assert sensor.read() == 22.0
+        sensor.close()
+
+    def test_w1_therm_crc_failure(self, tmp_path):
+        """Test error con CRC inválido"""
+        device = add_w1_device(tmp_path, "28-00000000000f", 85000, crc_ok=False)
+        with pytest.raises(SensorError):
+            W1Therm(str(device)).read()
+
+    def test_iio_raw_and_input(self, sysfs):
+        """Test canales IIO con raw/offset/scale y con _input"""
+        device = str(sysfs / "sys" / "bus" / "iio" / "devices" / "iio:device0")
+        temperature = IioChannel(device, "temp")
+        assert temperature.read() == pytest.approx(20.0)
+        assert temperature.sensor_id == "bme280-iio:device0:temp"
+        humidity = IioChannel(device, "humidityrelative")
+        assert humidity.read() == pytest.approx(45.25)
+        assert humidity.unit == "%"
+
+    def test_iio_fractional_input(self, tmp_path):
+        """Test _input con decimales (BMP280 in_pressure_input, luz)"""
+        device = tmp_path / "sys" / "bus" / "iio" / "devices" / "iio:device1"
+        device.mkdir(parents=True)
+        (device / "name").write_text("bmp280\n")
+        (device / "in_pressure_input").write_text("100.845664062\n")
+        (device / "in_illuminance_input").write_text("312.5\n")
+        with SensorBus(root=str(tmp_path)) as bus:
+            readings = bus.read_all()
+            errors = bus.errors
+        by_id = {reading["sensorId"]: reading["value"] for reading in readings}
+        assert errors == {}
+        assert by_id["bmp280-iio:device1:pressure"] == pytest.approx(100.845664062)
+        assert by_id["bmp280-iio:device1:illuminance"] == pytest.approx(312.5)
+
+    def test_iio_raw_must_be_integer(self, tmp_path):
+        """Test que un _raw no entero es un error"""
+        (tmp_path / "in_temp_raw").write_text("25.5\n")
+        sensor = IioChannel(str(tmp_path), "temp")
+        with pytest.raises(SensorError):
+            sensor.read()
+
+    def test_generic_sensor(self, tmp_path):
+        """Test atributo sysfs genérico (hwmon)"""
+        (tmp_path / "temp1_input").write_text("48000\n")
+        sensor = Sensor(str(tmp_path / "temp1_input"), "cpu", "temperature", "C", scale=0.001)
+        assert sensor.read() == 48.0
+        (tmp_path / "in_voltage").write_text("3.3\n")
+        assert Sensor(str(tmp_path / "in_voltage"), "vdd", "voltage", "V").read() == 3.3
+
+
+class TestDiscover:
+    """Tests de descubrimiento"""
+
+    def test_discover(self, sysfs):
+        """Test termómetros 1-Wire y canales IIO encontrados"""
+        ids = [sensor.sensor_id for sensor in discover(str(sysfs))]
+        assert ids == ["28-000000000001", "28-000000000002",
+                       "bme280-iio:device0:temp", "bme280-iio:device0:humidityrelative"]
+
+    def test_discover_empty(self, tmp_path):
+        """Test sin dispositivos"""
+        assert discover(str(tmp_path)) == []
+        assert SensorBus(root=str(tmp_path)).read_all() == []
+
+
+class SlowSensor(Sensor):
+    """Sensor que simula una conversión de 1-Wire"""
+
+    def __init__(self, path, sensor_id, delay):
+        super().__init__(path, sensor_id, "temperature", "C", scale=0.001)
+        self.delay = delay
+
+    def read(self):
+        time.sleep(self.delay)
+        return super().read()
+
+
+class TestSensorBus:
+    """Tests del bus de lectura concurrente"""
+
+    def test_read_all(self, sysfs):
+        """Test lecturas del árbol falso y disparo de conversión en bloque"""
+        with SensorBus(root=str(sysfs)) as bus:
+            readings = bus.read_all()
+        by_id = {reading["sensorId"]: reading for reading in readings}
+        assert by_id["28-000000000001"]["value"] == 21.5
+        assert by_id["28-000000000002"]["value"] == -1.25
+        assert by_id["bme280-iio:device0:humidityrelative"]["sensorType"] == "humidity"
+        assert all(reading["timestamp"] > 0 for reading in readings)
+        bulk = sysfs / "sys" / "devices" / "w1_bus_master1" / "therm_bulk_read"
+        assert bulk.read_bytes().startswith(b"trigger")
+
+    def test_failed_sensor_reported(self, sysfs):
+        """Test que un sensor que falla no impide leer el resto"""
+        add_w1_device(sysfs, "28-00000000000f", 85000, crc_ok=False)
+        with SensorBus(root=str(sysfs)) as bus:
+            readings = bus.read_all()
+            errors = bus.errors
+        assert len(readings) == 4
+        assert "CRC" in errors["28-00000000000f"]
+
+    def test_reads_are_concurrent(self, tmp_path):
+        """Test que 10 conversiones de 0.2 s no se leen en serie"""
+        sensors = []
+        for i in range(10):
+            path = tmp_path / f"temp{i}_input"
+            path.write_text(f"{20000 + i}\n")
+            sensors.append(SlowSensor(str(path), f"probe-{i}", delay=0.2))
+        with SensorBus(sensors) as bus:
+            start = time.monotonic()
+            readings = bus.read_all()
+            elapsed = time.monotonic() - start
+        assert [reading["value"] for reading in readings] == [20 + i / 1000 for i in range(10)]
+        assert elapsed < 1.0
+
+    def test_read_async(self, sysfs):
+        """Test lectura desde asyncio"""
+        with SensorBus(root=str(sysfs)) as bus:
+            readings = asyncio.run(bus.read_async())
+        assert len(readings) == 4
+
+    def test_send_and_evaluate(self, sysfs):
+        """Test subida por send_sensor_data y evaluación de reglas"""
+        engine = RuleEngine([
+            {"name": "probe_warm", "sensor": "28-000000000001", "type": "threshold",
+             "op": ">", "value": 20.0},
+            {"name": "freezing", "sensor": "temperature", "type": "threshold",
+             "op": "<", "value": 0.0},
+        ])
+        with StandinServer() as server, SensorBus(root=str(sysfs)) as bus:
+            agent = AgentHub(TEST_AGENT_ID, TEST_PRIVATE_KEY)
+            readings = bus.read_all()
+            result = bus.send(agent, server.url + "/api/iot/sensors", readings)
+            alerts = bus.evaluate(engine, readings)
+            stats = server.stats.snapshot()
+
+        assert result["success"] is True
+        assert stats["requests"] == {"/api/iot/sensors": 1}
+        assert sorted(alert["rule"] for alert in alerts) == ["freezing", "probe_warm"]
+
+    def test_type_rules_are_per_sensor(self, tmp_path):
+        """Test que las reglas por tipo no mezclan el estado de varias sondas"""
+        add_w1_device(tmp_path, "28-000000000001", 20000)
+        add_w1_device(tmp_path, "28-000000000002", 35000)
+        engine = RuleEngine([
+            {"name": "fast_rise", "sensor": "temperature", "type": "rate",
+             "op": ">", "value": 0.05, "window": 600},
+            {"name": "overheat", "sensor": "temperature", "type": "hysteresis",
+             "high": 30.0, "low": 28.0},
+        ])
+        fired = []
+        with SensorBus(root=str(tmp_path)) as bus:
+            for step in range(5):
+                readings = bus.read_all()
+                for reading in readings:
+                    reading["timestamp"] = step * 60000
+                fired.extend(bus.evaluate(engine, readings))
+
+        assert [(alert["rule"], alert["source"]) for alert in fired] == [
+            ("overheat", "28-000000000002")
+        ]
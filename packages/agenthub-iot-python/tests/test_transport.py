@@ -0,0 +1,193 @@
+"""
+Tests for AgentHub IoT HTTP transports and stand-in servers
+"""
+
+import asyncio
+import os
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import Mock
+
+import pytest
+
+# Add parent directory to path
+src_path = os.path.join(os.path.dirname(__file__), '..', 'src')
+if src_path not in sys.path:
+    sys.path.insert(0, src_path)
+
+from agenthub_iot import AgentHub  # type: ignore[reportMissingImports]
+from agenthub_iot.standin import StandinServer, handle_request  # type: ignore[reportMissingImports]
+from agenthub_iot.transport import RequestsTransport  # type: ignore[reportMissingImports]
+
+TEST_AGENT_ID = "test-iot-agent-001"
+TEST_PRIVATE_KEY = "0x" + "1" * 64
+
+
+class TestStandinRoutes:
+    """Tests de las respuestas simuladas"""
+
+    def test_known_routes(self):
+        """Test rutas de la API"""
+        assert handle_request("/api/iot/sensors", {"x-agent-id": "a"}, b"{}")[1]["agentId"] == "a"
+        assert handle_request("/api/iot/alerts", {"x-payment": "{}"}, b"{}")[1]["paymentVerified"] is True
+        assert handle_request("/api/x402/pay", {}, b"{}")[1]["txHash"].startswith("0x")
+
+    def test_unknown_route(self):
+        """Test ruta desconocida"""
+        assert handle_request("/api/unknown", {}, b"")[0] == 404
+
+
+class TestRequestsTransport:
+    """Tests del pool HTTP/1.1"""
+
+    def test_agent_paths_reuse_connection(self):
+        """Test sensores, alertas y series por una conexión reutilizada"""
+        with StandinServer() as server, RequestsTransport() as transport:
+            agent = AgentHub(TEST_AGENT_ID, TEST_PRIVATE_KEY, transport=transport)
+            sensors = agent.send_sensor_data(server.url + "/api/iot/sensors", {"temperature": 21.5})
+            alert = agent.x402_request(server.url + "/api/iot/alerts", "0.0001", {"alert": "x"})
+            series = agent.send_sensor_series(server.url + "/api/iot/sensors", [1, 2], [1.0, 2.0])
+            stats = server.stats.snapshot()
+
+        assert sensors["success"] is True
+        assert sensors["data"]["agentId"] == TEST_AGENT_ID
+        assert alert["success"] is True
+        assert alert["data"]["paymentVerified"] is True
+        assert series["success"] is True
+        assert stats["requests"] == {"/api/iot/sensors": 2, "/api/iot/alerts": 1}
+        assert stats["connections"] == 1
+
+    def test_transport_error(self):
+        """Test error de conexión por el transporte"""
+        with RequestsTransport() as transport:
+            agent = AgentHub(TEST_AGENT_ID, TEST_PRIVATE_KEY, transport=transport)
+            result = agent.send_sensor_data("http://127.0.0.1:9/api/iot/sensors", {"t": 1})
+        assert result["success"] is False
+        assert "error" in result
+
+
+class TestHttp2Transport:
+    """Tests del transporte HTTP/2 contra el stand-in h2c"""
+
+    @pytest.fixture
+    def h2_server(self):
+        pytest.importorskip("httpx")
+        pytest.importorskip("h2")
+        from agenthub_iot.standin import H2StandinServer  # type: ignore[reportMissingImports]
+        with H2StandinServer() as server:
+            yield server
+
+    def test_multiplexed_identities(self, h2_server):
+        """Test muchas identidades concurrentes sobre una conexión HTTP/2"""
+        from agenthub_iot.transport import Http2Transport  # type: ignore[reportMissingImports]
+
+        with Http2Transport(max_connections=1, http1=False) as transport:
+            agents = [
+                AgentHub(f"device-{i}", TEST_PRIVATE_KEY, transport=transport) for i in range(20)
+            ]
+            endpoint = h2_server.url + "/api/iot/sensors"
+            with ThreadPoolExecutor(20) as pool:
+                results = list(pool.map(
+                    lambda agent: agent.send_sensor_data(endpoint, {"temperature": 21.5}), agents
+                ))
+            response = transport.post(h2_server.url + "/api/iot/alerts", data="{}")
+
+        assert all(result["success"] for result in results)
+        assert {result["data"]["agentId"] for result in results} == {f"device-{i}" for i in range(20)}
+        assert response.http_version == "HTTP/2"
+        assert h2_server.stats.snapshot()["connections"] == 1
+
+    def test_binary_series_over_http2(self, h2_server):
+        """Test subida de serie binaria por HTTP/2"""
+        from agenthub_iot.transport import Http2Transport  # type: ignore[reportMissingImports]
+
+        with Http2Transport(http1=False) as transport:
+            agent = AgentHub(TEST_AGENT_ID, TEST_PRIVATE_KEY, transport=transport)
+            result = agent.send_sensor_series(h2_server.url + "/api/iot/sensors", [1, 2, 3], [1.0, 1.5, 2.0])
+        assert result["success"] is True
+        assert result["data"]["bytes"] == result["bytes"]
+
+    def test_async_paths(self, h2_server):
+        """Test sensores y alertas asyncio sobre HTTP/2"""
+        from agenthub_iot.transport import AsyncHttp2Transport  # type: ignore[reportMissingImports]
+
+        async def main():
+            async with AsyncHttp2Transport(http1=False) as transport:
+                agent = AgentHub(TEST_AGENT_ID, TEST_PRIVATE_KEY, async_transport=transport)
+                sensors = [
+                    agent.send_sensor_data_async(h2_server.url + "/api/iot/sensors", {"n": n})
+                    for n in range(10)
+                ]
+                alert = agent.x402_request_async(h2_server.url + "/api/iot/alerts", "0.0001", {"a": 1})
+                return await asyncio.gather(alert, *sensors)
+
+        results = asyncio.run(main())
+        assert all(result["success"] for result in results)
+        assert results[0]["data"]["paymentVerified"] is True
+        assert h2_server.stats.snapshot()["connections"] == 1
+
+
+class TestAsyncWithoutTransport:
+    """Tests de los métodos asyncio sin transporte configurado"""
+
+    def test_async_requires_transport(self):
+        """Test error si no hay async_transport"""
+        agent = AgentHub(TEST_AGENT_ID, TEST_PRIVATE_KEY)
+        result = asyncio.run(agent.send_sensor_data_async("http://h/api/iot/sensors", {"t": 1}))
+        assert result["success"] is False
+        result = asyncio.run(agent.x402_request_async("http://h/api/iot/alerts", "0.0001"))
+        assert result["success"] is False
+
+
+class FakeAsyncTransport:
+    """Transporte asyncio falso que registra las cabeceras enviadas"""
+
+    def __init__(self):
+        self.headers = []
+
+    async def post(self, url, **kwargs):
+        self.headers.append(kwargs["headers"])
+        response = Mock()
+        response.status_code = 200
+        response.headers = {"content-type": "application/json"}
+        response.json.return_value = {"ok": True}
+        return response
+
+
+class TestAsyncSigning:
+    """Tests de la firma x402 en el camino asyncio"""
+
+    def test_inline_signing_runs_off_the_event_loop(self):
+        """Test que sin autorización pre-firmada se firma fuera del hilo del bucle"""
+        transport = FakeAsyncTransport()
+        agent = AgentHub(TEST_AGENT_ID, TEST_PRIVATE_KEY, async_transport=transport)
+        signing_threads = []
+        build = agent._build_payment_header
+
+        def recording_build(*args):
+            signing_threads.append(threading.current_thread())
+            return build(*args)
+
+        agent._build_payment_header = recording_build
+        result = asyncio.run(agent.x402_request_async("http://h/api/iot/alerts", "0.0001", {"a": 1}))
+
+        assert result["success"] is True
+        assert signing_threads and signing_threads[0] is not threading.main_thread()
+        assert "x-payment" in transport.headers[0]
+
+    def test_presigned_header_used(self):
+        """Test que una autorización pre-firmada se usa sin firmar"""
+        transport = FakeAsyncTransport()
+        agent = AgentHub(TEST_AGENT_ID, TEST_PRIVATE_KEY, async_transport=transport)
+        url = "http://h/api/iot/alerts"
+        agent.start_presigning([(url, "0.0001", "USDC", "basic")], pool_size=1)
+        try:
+            agent._presign_pool.fill()
+            agent._presign_pool.stop()
+            agent._build_payment_header = Mock(side_effect=AssertionError("signed inline"))
+            result = asyncio.run(agent.x402_request_async(url, "0.0001", {"a": 1}))
+        finally:
+            agent.stop_presigning()
+        assert result["success"] is True
+        agent._build_payment_header.assert_not_called()